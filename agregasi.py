@@ -0,0 +1,528 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache_lru import LRUCache
+from hover import gabung_per_grup, teks
+from instrumentasi import tahap
+from rekonsiliasi import indeks_nama
+from data_loader import (
+    DATA_CSV, GEOJSON_KECAMATAN,
+    BULAN_ORDER, FORMAT_KOLUMNAR,
+    baca_kolumnar, kunci_geojson, load_banjir, load_geojson_kecamatan, path_rollup, periode_bulan,
+    tulis_kolumnar, versi_data,
+)
+
+SEMUA_WILAYAH = "Semua Wilayah"
+SEMUA_BULAN = "Semua Bulan"
+SEMUA_KECAMATAN = "Semua Kecamatan"
+SEMUA_KELURAHAN = "Semua Kelurahan"
+SEMUA_TAHUN = "Semua Tahun"
+
+# Pilihan granularitas grafik tren multi-tahun -> frekuensi pandas Period
+FREKUENSI_TREN = {'Bulan': 'M', 'Triwulan': 'Q', 'Tahun': 'Y'}
+
+# 6 pilihan wilayah x 13 pilihan bulan = 78 kombinasi filter tingkat wilayah,
+# ditambah kombinasi drill-down kecamatan/kelurahan yang sedang dipakai
+_cube = LRUCache(max_entries=256)
+
+# Rollup: jumlah per (wilayah, kecamatan, tahun, bulan, triwulan). Agregat yang
+# hanya menjumlahkan kolom-kolom ini (bulan, triwulan, wilayah, peta kecamatan,
+# evakuasi, tren periode) dihitung dari rollup, sehingga ukurannya tidak tumbuh
+# dengan jumlah baris dan bisa diperbarui secara inkremental saat data baru
+# ditambahkan.
+KOLOM_ROLLUP = ['wilayah_adm', 'kecamatan', 'tahun', 'bulan', 'triwulan']
+NILAI_ROLLUP = ['jumlah_kejadian', 'jumlah_pengungsi', 'jumlah_tempat_pengungsian']
+_rollup = LRUCache(max_entries=4)
+
+# Versi rollup tersimpan (file `path_rollup`, ditulis oleh ingest); rollup
+# tersimpan dengan versi lain dianggap basi dan dihitung ulang dari baris
+FORMAT_ROLLUP = FORMAT_KOLUMNAR + ".rollup1"
+
+# Tren multi-tahun per filter wilayah/kecamatan/kelurahan (tanpa tahun/bulan)
+_tren = LRUCache(max_entries=64)
+
+# Tabel per baris untuk grafik top 10: {nama: (kunci, kolom nilai, fungsi)}.
+# Semua kunci memuat wilayah_adm sehingga bisa dihitung per partisi wilayah.
+TABEL_BARIS = {
+    'Kecamatan': (['kecamatan', 'wilayah_adm'], ['jumlah_kejadian', 'jumlah_pengungsi'], 'sum'),
+    'Kelurahan': (['kelurahan', 'kecamatan', 'wilayah_adm'], ['jumlah_kejadian', 'jumlah_pengungsi'], 'sum'),
+    'tinggi_Kecamatan': (['kecamatan', 'wilayah_adm', 'kecamatan_wilayah'],
+                         ['tinggi_air_avg', 'tinggi_air_max'], 'mean'),
+    'tinggi_Kelurahan': (['kelurahan', 'kecamatan', 'wilayah_adm', 'kelurahan_kecamatan_wilayah'],
+                         ['tinggi_air_avg', 'tinggi_air_max'], 'mean'),
+}
+
+# Data dengan baris sebanyak ini atau lebih diagregasi per partisi wilayah_adm
+# secara paralel; jumlah thread dapat diatur lewat env BANJIR_PEKERJA
+BATAS_PARALEL = 200_000
+PEKERJA = int(os.environ.get("BANJIR_PEKERJA", os.cpu_count() or 1))
+_pool = ThreadPoolExecutor(max_workers=max(PEKERJA, 1), thread_name_prefix="agregasi")
+
+
+# Pembulatan khusus tinggi air
+def pembulatan_tinggi(x):
+    desimal = round(x, 1)
+    desimal_digit = int(str(desimal).split('.')[-1][0])
+    if 1 <= desimal_digit <= 5:
+        return int(np.floor(desimal))
+    elif 6 <= desimal_digit <= 9:
+        return int(np.ceil(desimal))
+    else:
+        return int(desimal)
+
+
+def pembulatan_tinggi_array(x):
+    """Versi vektor dari `pembulatan_tinggi` untuk seluruh kolom sekaligus.
+
+    Aturannya identik: nilai dibulatkan ke 1 desimal (seperti `round` bawaan
+    Python), lalu digit desimal 1-5 dibulatkan ke bawah, 6-9 ke atas, dan 0
+    dipotong ke bilangan bulat. Hasil berupa array int64."""
+    x = np.asarray(x, dtype='float64')
+    if not np.all(np.isfinite(x)):
+        raise ValueError("pembulatan_tinggi_array membutuhkan nilai finite")
+
+    # np.round (x * 10 lalu rint) bisa berbeda dari round() Python untuk
+    # nilai yang sangat dekat dengan .x5; nilai seperti itu dihitung ulang
+    # secara skalar agar hasilnya persis sama (lewat float: round() pada
+    # np.float64 memakai pembulatan numpy, bukan milik Python).
+    desimal = np.round(x, 1)
+    skala = x * 10
+    dekat_setengah = np.abs(skala - np.floor(skala) - 0.5) < 1e-6
+    if dekat_setengah.any():
+        desimal[dekat_setengah] = [round(float(v), 1) for v in x[dekat_setengah]]
+
+    desimal_digit = np.rint(np.abs(desimal) * 10) % 10
+    hasil = np.where(
+        desimal_digit == 0, np.trunc(desimal),
+        np.where(desimal_digit <= 5, np.floor(desimal), np.ceil(desimal))
+    )
+    return hasil.astype('int64')
+
+
+def _kode_kunci(df, kunci):
+    # Kunci groupby berupa kode kategori (int): biayanya tidak bergantung pada
+    # jumlah kategori (kelurahan bisa ratusan ribu), dan urutan kode sama
+    # dengan urutan hasil groupby pada kolom kategorinya
+    return [
+        df[col].cat.codes.rename(col) if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col]
+        for col in kunci
+    ]
+
+
+def _groupby_kode(df, spesifikasi):
+    hasil = {}
+    for nama, (kunci, nilai, fungsi) in spesifikasi.items():
+        kode = _kode_kunci(df, kunci)
+        # Baris dengan kategori kosong (kode -1) dibuang seperti groupby biasa
+        valid = np.ones(len(df), dtype=bool)
+        for k in kode:
+            if k.dtype.kind == 'i':
+                valid &= k.to_numpy() >= 0
+        # Jumlah dihitung dalam int64 (groupby pada int8/int16 mempertahankan
+        # tipe kecil); salinan sementara ini hanya untuk kolom nilai
+        data = df[nilai]
+        data = data.astype({col: 'int64' for col in data.select_dtypes(include='integer').columns})
+        if not valid.all():
+            kode, data = [k[valid] for k in kode], data[valid]
+        hasil[nama] = data.groupby(kode, sort=False).agg(fungsi)
+    return hasil
+
+
+def _gabung_kode(bagian, df, kunci):
+    # Grup tidak pernah terbelah antar partisi, jadi penggabungan cukup
+    # concat lalu urutkan menurut kode kunci (= urutan groupby satu kali jalan)
+    hasil = pd.concat(bagian).sort_index()
+    level = []
+    for i, col in enumerate(kunci):
+        nilai = hasil.index.get_level_values(i)
+        dtype = df[col].dtype
+        level.append(pd.Categorical.from_codes(nilai, dtype=dtype) if isinstance(dtype, pd.CategoricalDtype)
+                     else nilai.astype(dtype))
+    hasil.index = pd.MultiIndex.from_arrays(level, names=kunci)
+    return hasil.reset_index()
+
+
+def _partisi_wilayah(df):
+    # Urutan baris di dalam partisi dipertahankan (argsort stabil) sehingga
+    # rata-rata per grup dijumlahkan dalam urutan yang sama persis
+    kode = df['wilayah_adm'].cat.codes.to_numpy()
+    urutan = np.argsort(kode, kind='stable')
+    batas = np.flatnonzero(np.diff(kode[urutan])) + 1
+    return [df.take(posisi) for posisi in np.split(urutan, batas)]
+
+
+def agregat_partisi(df, spesifikasi):
+    """Hitung tabel groupby `spesifikasi` ({nama: (kunci, kolom nilai,
+    fungsi)}) dan kembalikan {nama: DataFrame} dengan kolom kunci bertipe
+    sama seperti di `df`.
+
+    Setiap kunci harus memuat wilayah_adm. Data besar (>= BATAS_PARALEL
+    baris) dipartisi per wilayah_adm dan tiap partisi dihitung di thread
+    pool; karena grup tidak terbelah antar partisi, hasil gabungannya
+    identik dengan perhitungan satu kali jalan."""
+    kolom = list(dict.fromkeys(col for kunci, nilai, _ in spesifikasi.values() for col in kunci + nilai))
+    df = df[kolom]
+    if len(df) >= BATAS_PARALEL and PEKERJA > 1:
+        partisi = _partisi_wilayah(df)
+    else:
+        partisi = [df]
+    if len(partisi) > 1:
+        parsial = list(_pool.map(lambda bagian: _groupby_kode(bagian, spesifikasi), partisi))
+    else:
+        parsial = [_groupby_kode(df, spesifikasi)]
+    return {
+        nama: _gabung_kode([p[nama] for p in parsial], df, kunci)
+        for nama, (kunci, _, _) in spesifikasi.items()
+    }
+
+
+def _agregat_bulan(df_filtered):
+    # Bulanan
+    agg_bulan = df_filtered.groupby('bulan', observed=False)['jumlah_kejadian'].sum().reset_index()
+
+    # Tambahan: hover detail wilayah (hanya wilayah yang ada pada hasil filter)
+    wilayah = df_filtered['wilayah_adm'].cat.remove_unused_categories()
+    wilayah_bulan = df_filtered.groupby(['bulan', wilayah], observed=False)['jumlah_kejadian'].sum().reset_index()
+
+    kepala = teks("Bulan ", agg_bulan['bulan'], ": ", agg_bulan['jumlah_kejadian'], " kejadian")
+    kepala.index = agg_bulan['bulan']
+    baris = teks("<br>", wilayah_bulan['wilayah_adm'], ": ", wilayah_bulan['jumlah_kejadian'])
+
+    agg_bulan['custom_hover'] = gabung_per_grup(kepala, baris, wilayah_bulan['bulan']).values
+    return agg_bulan
+
+
+def _agregat_peta_kecamatan(df_filtered, geojson_kecamatan):
+    # Nama kecamatan dicocokkan ke fitur GeoJSON sekali per daftar kategori
+    # (lihat rekonsiliasi.py); per baris cukup lookup array lewat kode kategori
+    geo_kecamatan = [f['properties']['name'] for f in geojson_kecamatan['features']]
+    kecamatan = df_filtered['kecamatan'].astype('category')
+    cocok = indeks_nama(kecamatan.cat.categories, geo_kecamatan)
+
+    kode = kecamatan.cat.codes.to_numpy()
+    jumlah = df_filtered['jumlah_kejadian'].to_numpy()
+    per_kategori = np.bincount(kode[kode >= 0], weights=jumlah[kode >= 0],
+                               minlength=len(kecamatan.cat.categories))
+
+    di_peta = cocok.posisi_fitur >= 0
+    full_data = pd.DataFrame({
+        'name': geo_kecamatan,
+        'jumlah_kejadian': np.bincount(cocok.posisi_fitur[di_peta], weights=per_kategori[di_peta],
+                                       minlength=len(geo_kecamatan)),
+    })
+
+    # Kejadian pada kecamatan yang tidak ada di GeoJSON (tidak tampil di peta)
+    tanpa_peta = pd.DataFrame({
+        'kecamatan': kecamatan.cat.categories[~di_peta],
+        'jumlah_kejadian': per_kategori[~di_peta].astype('int64'),
+    })
+    return full_data, tanpa_peta[tanpa_peta['jumlah_kejadian'] > 0].reset_index(drop=True)
+
+
+def _top_kejadian(tabel):
+    hasil = {}
+    for level, kolom in [
+        ('Kecamatan', ['kecamatan', 'wilayah_adm']),
+        ('Kelurahan', ['kelurahan', 'kecamatan', 'wilayah_adm']),
+    ]:
+        agg = tabel[level][kolom + ['jumlah_kejadian']]
+        top10 = agg.sort_values(by='jumlah_kejadian', ascending=False).head(10)
+        # Label kecamatan tetap huruf kapital seperti pada peta kecamatan
+        hasil[level] = top10.assign(kecamatan=kunci_geojson(top10['kecamatan']).values)
+    return hasil
+
+
+def _top_tinggi_air(tabel):
+    hasil = {}
+    for level in ['Kecamatan', 'Kelurahan']:
+        # Label gabungan sudah tersedia sebagai kolom kategori di dataset
+        agg = tabel['tinggi_' + level].copy()
+
+        # Bulatkan hasil
+        agg['tinggi_air_avg_bulat'] = pembulatan_tinggi_array(agg['tinggi_air_avg'])
+        agg['tinggi_air_max_bulat'] = pembulatan_tinggi_array(agg['tinggi_air_max'])
+
+        hasil[level] = agg.sort_values(by='tinggi_air_avg_bulat', ascending=False).head(10)
+    return hasil
+
+
+def _ringkasan_evakuasi(df_filtered):
+    # Total per wilayah
+    evakuasi_summary = (
+        df_filtered
+        .groupby('wilayah_adm', observed=True)[['jumlah_pengungsi', 'jumlah_tempat_pengungsian']]
+        .sum()
+        .reset_index()
+    )
+
+    # Detail bulanan per wilayah
+    bulanan = (
+        df_filtered
+        .groupby(['wilayah_adm', 'bulan'], observed=True)[['jumlah_pengungsi', 'jumlah_tempat_pengungsian']]
+        .sum()
+        .reset_index()
+    )
+
+    # Hover info format: total wilayah + bulan yang memiliki pengungsi/tempat
+    kepala = teks(
+        "Wilayah: ", evakuasi_summary['wilayah_adm'],
+        "<br>Jumlah Pengungsi: ", evakuasi_summary['jumlah_pengungsi'],
+        "<br>Jumlah Tempat Pengungsian: ", evakuasi_summary['jumlah_tempat_pengungsian']
+    )
+    kepala.index = evakuasi_summary['wilayah_adm']
+
+    bulanan = bulanan[(bulanan['jumlah_pengungsi'] > 0) | (bulanan['jumlah_tempat_pengungsian'] > 0)]
+    baris = teks(
+        "<br>", bulanan['bulan'],
+        ":<br>Pengungsi: ", bulanan['jumlah_pengungsi'],
+        "<br>Tempat: ", bulanan['jumlah_tempat_pengungsian']
+    )
+
+    evakuasi_summary['hover_text'] = gabung_per_grup(kepala, baris, bulanan['wilayah_adm']).values
+    return evakuasi_summary.sort_values('jumlah_pengungsi', ascending=False)
+
+
+def _top_pengungsi(df_filtered, tabel):
+    hasil = {}
+    for level, kolom in [
+        ('Kecamatan', ['kecamatan', 'wilayah_adm']),
+        ('Kelurahan', ['kelurahan', 'kecamatan', 'wilayah_adm']),
+    ]:
+        total = tabel[level][kolom + ['jumlah_pengungsi']]
+        top10 = total.sort_values('jumlah_pengungsi', ascending=False).head(10)
+
+        # Ambil baris kejadian dengan jumlah pengungsi tertinggi di tiap wilayah
+        kunci = kolom[0]
+        kejadian_tertinggi = df_filtered[df_filtered[kunci].isin(top10[kunci])]
+        idx_max = kejadian_tertinggi.groupby(kunci, observed=True)['jumlah_pengungsi'].idxmax()
+        data_max = kejadian_tertinggi.loc[idx_max][
+            kolom + ['bulan', 'jumlah_pengungsi', 'jumlah_tempat_pengungsian']
+        ].rename(columns={
+            'bulan': 'bulan_kejadian_tertinggi',
+            'jumlah_pengungsi': 'jumlah_pengungsi_tertinggi',
+            'jumlah_tempat_pengungsian': 'jumlah_tempat_pengungsian_kejadian_tertinggi'
+        })
+
+        data_max = data_max.astype({col: 'int64' for col in data_max.select_dtypes(include='integer').columns})
+        df_plot = top10.merge(data_max, on=kolom, how='left')
+        nama = [df_plot[kolom[0]]]
+        for col in kolom[1:]:
+            nama += [", ", df_plot[col]]
+        df_plot['hover_text'] = teks(
+            *nama,
+            "<br>Bulan Kejadian (Pengungsi Tertinggi): ", df_plot['bulan_kejadian_tertinggi'],
+            "<br>Jumlah Pengungsi Tertinggi: ", df_plot['jumlah_pengungsi_tertinggi'],
+            "<br>Jumlah Tempat Pengungsian: ", df_plot['jumlah_tempat_pengungsian_kejadian_tertinggi']
+        )
+        hasil[level] = df_plot
+    return hasil
+
+
+def _label_periode(periode):
+    if periode.freqstr.startswith('M'):
+        return [f"{BULAN_ORDER[p.month - 1]} {p.year}" for p in periode]
+    if periode.freqstr.startswith('Q'):
+        return [f"Triwulan {p.quarter} {p.year}" for p in periode]
+    return [str(p.year) for p in periode]
+
+
+def _tren_periode(rollup):
+    # Deret bulanan lengkap (bulan tanpa kejadian bernilai 0) dengan indeks
+    # Period, lalu diringkas ke triwulan dan tahun dari deret tersebut
+    per_bulan = rollup.groupby(['tahun', 'bulan'], observed=True)['jumlah_kejadian'].sum()
+    deret = pd.Series(
+        per_bulan.to_numpy(),
+        index=periode_bulan(per_bulan.index.get_level_values('tahun'),
+                            per_bulan.index.get_level_values('bulan')),
+        dtype='int64'
+    )
+    if len(deret):
+        deret = deret.reindex(pd.period_range(deret.index.min(), deret.index.max(), freq='M'), fill_value=0)
+
+    hasil = {}
+    for nama, freq in FREKUENSI_TREN.items():
+        ringkas = deret if freq == 'M' else deret.groupby(deret.index.asfreq(freq)).sum()
+        hasil[nama] = pd.DataFrame({
+            'periode': _label_periode(ringkas.index),
+            'jumlah_kejadian': ringkas.to_numpy(),
+        })
+    return hasil
+
+
+def filter_data(df, wilayah=SEMUA_WILAYAH, bulan=SEMUA_BULAN,
+                kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN, tahun=SEMUA_TAHUN):
+    # Terapkan filter global Dashboard
+    df_filtered = df
+    if tahun != SEMUA_TAHUN:
+        df_filtered = df_filtered[df_filtered["tahun"] == tahun]
+    if wilayah != SEMUA_WILAYAH:
+        df_filtered = df_filtered[df_filtered["wilayah_adm"] == wilayah]
+    if bulan != SEMUA_BULAN:
+        df_filtered = df_filtered[df_filtered["bulan"] == bulan]
+    if kecamatan != SEMUA_KECAMATAN:
+        df_filtered = df_filtered[df_filtered["kecamatan"] == kecamatan]
+    if kelurahan != SEMUA_KELURAHAN:
+        df_filtered = df_filtered[df_filtered["kelurahan"] == kelurahan]
+    return df_filtered
+
+
+def posisi_filter(df, wilayah=SEMUA_WILAYAH, bulan=SEMUA_BULAN,
+                  kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN, tahun=SEMUA_TAHUN):
+    """Posisi baris `df` (untuk `iloc`) yang lolos filter global Dashboard."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, nilai, semua in [
+        ('tahun', tahun, SEMUA_TAHUN),
+        ('wilayah_adm', wilayah, SEMUA_WILAYAH),
+        ('bulan', bulan, SEMUA_BULAN),
+        ('kecamatan', kecamatan, SEMUA_KECAMATAN),
+        ('kelurahan', kelurahan, SEMUA_KELURAHAN),
+    ]:
+        if nilai != semua:
+            mask &= (df[col] == nilai).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def baris_dashboard(kolom, wilayah=SEMUA_WILAYAH, bulan=SEMUA_BULAN,
+                    kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN, tahun=SEMUA_TAHUN):
+    """Kolom `kolom` dari baris yang lolos filter Dashboard, untuk grafik per
+    baris (scatter). Tidak di-cache: salinan baris tidak disimpan di cube,
+    hanya figur hasilnya yang di-cache (grafik.py)."""
+    with tahap('load'):
+        df = load_banjir()
+    with tahap('filter'):
+        return df.iloc[posisi_filter(df, wilayah, bulan, kecamatan, kelurahan, tahun)][list(kolom)]
+
+
+def hitung_rollup(df):
+    """Jumlah NILAI_ROLLUP (int64) per kombinasi KOLOM_ROLLUP yang ada di `df`."""
+    df = df[KOLOM_ROLLUP + NILAI_ROLLUP]
+    df = df.astype({col: 'int64' for col in df.select_dtypes(include='integer').columns})
+    return agregat_partisi(df, {'rollup': (KOLOM_ROLLUP, NILAI_ROLLUP, 'sum')})['rollup']
+
+
+def gabung_rollup(rollup, delta):
+    """Rollup gabungan dari `rollup` lama dan rollup baris baru `delta`.
+
+    Kategori `delta` harus mencakup kategori `rollup` (mis. dihitung dari
+    ekor data gabungan), sehingga biayanya sebanding dengan ukuran rollup."""
+    rollup = rollup.astype({col: delta[col].dtype for col in KOLOM_ROLLUP})
+    gabungan = pd.concat([rollup, delta], ignore_index=True)
+    return gabungan.groupby(KOLOM_ROLLUP, observed=True)[NILAI_ROLLUP].sum().reset_index()
+
+
+def _baca_rollup(path):
+    rollup = baca_kolumnar(path, path_rollup(path), FORMAT_ROLLUP)
+    return hitung_rollup(load_banjir(path)) if rollup is None else rollup
+
+
+def rollup_data(path=DATA_CSV):
+    """Rollup data banjir, sekali per versi data. Rollup tersimpan (ditulis
+    `simpan_rollup`) dipakai jika masih sesuai hash CSV; selain itu dihitung
+    dari seluruh baris."""
+    return _rollup.get_or_compute(versi_data(path), lambda: _baca_rollup(path))
+
+
+def simpan_rollup(rollup, path=DATA_CSV):
+    """Simpan `rollup` untuk isi `path` saat ini: ke file di samping salinan
+    kolumnar (dibaca proses lain lewat `rollup_data`) dan ke cache proses ini."""
+    tulis_kolumnar(rollup, path, path_rollup(path), FORMAT_ROLLUP)
+    return _rollup.get_or_compute(versi_data(path), lambda: rollup)
+
+
+def daftar_tahun():
+    """Tahun yang ada di data aktif (terurut), dari rollup tanpa memindai baris."""
+    return sorted(int(t) for t in rollup_data()['tahun'].unique())
+
+
+def hitung_agregat(df_filtered, geojson_kecamatan, rollup=None):
+    """Hitung semua tabel agregat dari data yang sudah difilter (tanpa cache).
+
+    `rollup` (opsional) adalah rollup yang sudah difilter sama dengan
+    `df_filtered`; jika tidak diberikan, dihitung dari `df_filtered`. Hasil
+    hanya berisi tabel agregat (tanpa baris `df_filtered`), sehingga ukuran
+    cube tidak tumbuh dengan jumlah baris; grafik per baris memakai
+    `baris_dashboard`."""
+    # Teks sudah dinormalisasi saat load (kategori kanonik di data_loader.py).
+    # Kolom hitungan disimpan dengan integer kecil dan tidak disalin ke int64
+    # per kombinasi filter: groupby meng-upcast kolom nilainya sendiri
+    # (`agregat_partisi`), dan baris yang ditampilkan apa adanya di-upcast di
+    # tempat pemakaiannya (kejadian tertinggi, scatter).
+    if rollup is None:
+        rollup = hitung_rollup(df_filtered)
+
+    tabel = agregat_partisi(df_filtered, TABEL_BARIS)
+    agg_wilayah = rollup.groupby('wilayah_adm', observed=True)['jumlah_kejadian'].sum().reset_index()
+    kecamatan_map, kecamatan_tanpa_peta = _agregat_peta_kecamatan(rollup, geojson_kecamatan)
+
+    return {
+        'bulan': _agregat_bulan(rollup),
+        'triwulan': rollup.groupby('triwulan')['jumlah_kejadian'].sum().reset_index(),
+        'wilayah': agg_wilayah,
+        'kecamatan_map': kecamatan_map,
+        'kecamatan_tanpa_peta': kecamatan_tanpa_peta,
+        'top_kejadian': _top_kejadian(tabel),
+        'tinggi_air': _top_tinggi_air(tabel),
+        'evakuasi': _ringkasan_evakuasi(rollup),
+        'pengungsi': _top_pengungsi(df_filtered, tabel),
+    }
+
+
+def _hitung_agregat_dashboard(wilayah, bulan, kecamatan, kelurahan, tahun):
+    with tahap('load'):
+        df, geo = load_banjir(), load_geojson_kecamatan()
+        # Rollup tidak memuat kelurahan; filter kelurahan dihitung dari baris mentah
+        rollup = rollup_data() if kelurahan == SEMUA_KELURAHAN else None
+    with tahap('filter'):
+        df_filtered = filter_data(df, wilayah, bulan, kecamatan, kelurahan, tahun)
+        if rollup is not None:
+            rollup = filter_data(rollup, wilayah, bulan, kecamatan, tahun=tahun)
+    with tahap('agregasi'):
+        return hitung_agregat(df_filtered, geo, rollup)
+
+
+def agregat_dashboard(wilayah=SEMUA_WILAYAH, bulan=SEMUA_BULAN,
+                      kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN, tahun=SEMUA_TAHUN):
+    """Semua tabel agregat yang dibutuhkan grafik Dashboard untuk satu kombinasi
+    filter. Hasil di-memo per proses dan dibagi antar sesi: jangan diubah."""
+    kunci = (versi_data(), versi_data(GEOJSON_KECAMATAN), wilayah, bulan, kecamatan, kelurahan, tahun)
+    return _cube.get_or_compute(
+        kunci,
+        lambda: _hitung_agregat_dashboard(wilayah, bulan, kecamatan, kelurahan, tahun)
+    )
+
+
+def hitung_tren(wilayah=SEMUA_WILAYAH, kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN):
+    """Tren seluruh periode untuk filter wilayah (tanpa cache)."""
+    with tahap('load'):
+        # Rollup tidak memuat kelurahan; filter kelurahan dihitung dari baris mentah
+        rollup = rollup_data() if kelurahan == SEMUA_KELURAHAN else None
+    with tahap('filter'):
+        if rollup is None:
+            df_filtered = filter_data(load_banjir(), wilayah, kecamatan=kecamatan, kelurahan=kelurahan)
+        else:
+            rollup = filter_data(rollup, wilayah, kecamatan=kecamatan)
+    with tahap('agregasi'):
+        if rollup is None:
+            rollup = hitung_rollup(df_filtered)
+        return _tren_periode(rollup)
+
+
+def agregat_tren(wilayah=SEMUA_WILAYAH, kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN):
+    """Tren seluruh periode per granularitas (FREKUENSI_TREN) untuk filter
+    wilayah; dihitung dari rollup, bukan dari cube `agregat_dashboard`, karena
+    filter tahun dan bulan tidak berlaku. Hasil dibagi antar sesi: jangan diubah."""
+    return _tren.get_or_compute(
+        (versi_data(), wilayah, kecamatan, kelurahan),
+        lambda: hitung_tren(wilayah, kecamatan, kelurahan)
+    )
+
+
+def cube_stats():
+    return _cube.stats()
+
+
+def cube_clear():
+    _cube.clear()
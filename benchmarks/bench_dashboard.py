@@ -0,0 +1,404 @@
+"""Benchmark rerun halaman Dashboard dan DataFrame secara headless.
+
+Contoh:
+
+    python benchmarks/bench_dashboard.py                     # dataset asli
+    python benchmarks/bench_dashboard.py --skala 1 10 100 1000
+    python benchmarks/bench_dashboard.py --matriks penuh --output bench.json
+
+Untuk setiap skala dibuat dataset sintetis (banjir.csv diulang N kali dengan
+nama kelurahan dan angka yang divariasikan), lalu dijalankan di subprocess
+terpisah sehingga cache dan memori puncak tiap skala tidak saling memengaruhi.
+Yang diukur:
+
+- per tahap: load, filter, agregasi, bangun figur, serialisasi (waktu untuk
+  setiap filter; memori puncak tracemalloc pada filter pertama, yang
+  terluas), dengan semua cache dalam keadaan kosong;
+- per halaman: waktu rerun lewat streamlit AppTest untuk matriks filter
+  sidebar (wilayah, tahun, bulan, drill-down kecamatan/kelurahan) dan widget
+  halaman: selectbox tingkat wilayah, periode tren dan mode peta di
+  Dashboard; pencarian, pengurutan dan halaman tabel di DataFrame. Run
+  pertama setelah cache proses dikosongkan = cold, berikutnya warm.
+"""
+import argparse
+import itertools
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEVEL = ["Kecamatan", "Kelurahan"]
+
+
+# =====================
+# 🧪 DATASET SINTETIS
+# =====================
+def buat_dataset(skala, folder):
+    import numpy as np
+    import pandas as pd
+
+    path = os.path.join(folder, f"banjir_x{skala}.csv")
+    if skala == 1:
+        pd.read_csv(os.path.join(ROOT, "banjir.csv")).to_csv(path, index=False)
+        return path
+
+    asli = pd.read_csv(os.path.join(ROOT, "banjir.csv"))
+    rng = np.random.default_rng(skala)
+    salinan = []
+    for i in range(skala):
+        df = asli.copy()
+        if i:
+            # Nama kelurahan baru agar kardinalitas ikut tumbuh seperti data nyata
+            df["kelurahan"] = df["kelurahan"] + f" {i}"
+            df["kelurahan_kecamatan_wilayah"] = (
+                df["kelurahan"] + ", " + df["kecamatan"] + ", " + df["wilayah_adm"]
+            )
+            for col in ["jumlah_kejadian", "jumlah_pengungsi", "jumlah_tempat_pengungsian"]:
+                df[col] = rng.permutation(df[col].to_numpy())
+            df["tinggi_air_avg"] = (df["tinggi_air_avg"] * rng.uniform(0.5, 1.5, len(df))).round(1)
+        salinan.append(df)
+    pd.concat(salinan, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+# =====================
+# ⏱️ PENGUKURAN PER TAHAP
+# =====================
+def _ukur(hasil, tahap, fungsi, memori=True):
+    # Waktu diukur tanpa tracemalloc (tracing memperlambat alokasi); memori
+    # puncak diukur dengan menjalankan tahap yang sama sekali lagi. Tracing
+    # membuat bangun figur ~4x lebih lambat, jadi bisa dilewati (`memori`).
+    mulai = time.perf_counter()
+    nilai = fungsi()
+    durasi = time.perf_counter() - mulai
+
+    puncak = None
+    if memori:
+        tracemalloc.start()
+        fungsi()
+        _, puncak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    hasil.setdefault(tahap, []).append({"detik": durasi, "puncak_bytes": puncak})
+    return nilai
+
+
+def bench_tahap(matriks):
+    import plotly.io as pio
+
+    import agregasi
+    import data_loader
+    import grafik
+
+    hasil = {}
+
+    def load_cold():
+        data_loader.clear_cache()
+        return data_loader.load_banjir()
+
+    df = _ukur(hasil, "load", load_cold)
+    geo = data_loader.load_geojson_kecamatan()
+    payload = {}
+
+    for i, (wilayah, bulan, kecamatan, kelurahan, tahun) in enumerate(matriks):
+        # Memori puncak hanya pada filter pertama (semua wilayah, data terbanyak)
+        memori = i == 0
+        df_filtered = _ukur(hasil, "filter", lambda: agregasi.filter_data(
+            df, wilayah, bulan, kecamatan, kelurahan, tahun), memori)
+        agregat = _ukur(hasil, "agregasi", lambda: agregasi.hitung_agregat(df_filtered, geo), memori)
+        tren = _ukur(hasil, "agregasi:tren", lambda: agregasi.hitung_tren(wilayah, kecamatan, kelurahan), memori)
+        for chart_id, builder in grafik.GRAFIK.items():
+            sumber = agregat
+            if chart_id in grafik.GRAFIK_SEMUA_PERIODE:
+                sumber = tren
+            elif chart_id in grafik.GRAFIK_BARIS:
+                sumber = df_filtered
+            levels = [None]
+            if chart_id == 'tren':
+                levels = list(agregasi.FREKUENSI_TREN)
+            elif chart_id in grafik.GRAFIK_BERLEVEL:
+                levels = LEVEL
+            for level in levels:
+                fig = _ukur(hasil, f"figur:{chart_id}", lambda: builder(sumber, level), memori)
+                spec = _ukur(hasil, f"serialisasi:{chart_id}", lambda: pio.to_json(fig, validate=False), memori)
+                payload.setdefault(chart_id, []).append(len(spec))
+
+    ringkas = {}
+    for tahap, ukuran in hasil.items():
+        detik = [u["detik"] for u in ukuran]
+        ringkas[tahap] = {
+            "n": len(detik),
+            "median_ms": statistics.median(detik) * 1000,
+            "max_ms": max(detik) * 1000,
+            "puncak_mb": max(u["puncak_bytes"] for u in ukuran if u["puncak_bytes"] is not None) / 2**20,
+        }
+    for chart_id, ukuran in payload.items():
+        ringkas[f"serialisasi:{chart_id}"]["payload_kb_max"] = max(ukuran) / 1024
+    return {"baris": len(df), "tahap": ringkas}
+
+
+# =====================
+# 🖥️ PENGUKURAN PER HALAMAN (AppTest)
+# =====================
+# Widget utama Dashboard: (jenis, key atau label, pilihan). Selectbox tingkat
+# wilayah pertama tidak punya key sehingga dicari lewat label.
+WIDGET_DASHBOARD = [
+    ("selectbox", "Pilih Tingkat Wilayah", LEVEL),
+    ("selectbox", "tinggi_air_opsi", LEVEL),
+    ("selectbox", "top_pengungsi_level", LEVEL),
+    ("selectbox", "tren_periode", ["Bulan", "Triwulan", "Tahun"]),
+    ("radio", "mode_peta", ["Poligon", "Titik Pusat"]),
+]
+
+# Sidebar Dashboard per elemen tuple filter (wilayah, bulan, kecamatan,
+# kelurahan, tahun) dan kolom multiselect DataFrame yang setara
+SIDEBAR_DASHBOARD = ["Pilih Wilayah Administratif", "Pilih Bulan", "Pilih Kecamatan",
+                     "Pilih Kelurahan", "Pilih Tahun"]
+KOLOM_DATAFRAME = ["wilayah_adm", "bulan", "kecamatan", "kelurahan", "tahun"]
+
+
+def _widget(at, jenis, nama):
+    # Widget berdasarkan key; jika tidak ada, widget tanpa key dengan label `nama`
+    daftar = list(getattr(at, jenis))
+    for w in daftar:
+        if w.key == nama:
+            return w
+    for w in daftar:
+        if w.key is None and w.label == nama:
+            return w
+    raise KeyError(f"{jenis} {nama!r} tidak ditemukan")
+
+
+def _jalankan(halaman, tahap):
+    """Render `halaman` lalu terapkan setiap tahap [(jenis, nama, nilai)] dan
+    rerun; nilai berupa fungsi dipanggil dengan widget-nya. Widget yang
+    opsinya bergantung pada widget lain (kecamatan, kelurahan) diatur pada
+    tahap berikutnya karena identitas widget ikut berubah bersama opsinya.
+    Mengembalikan (detik render pertama, detik rerun terakhir)."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "pages", halaman), default_timeout=600)
+    waktu = []
+    for atur in [[]] + [t for t in tahap if t]:
+        for jenis, nama, nilai in atur:
+            w = _widget(at, jenis, nama)
+            w.set_value(nilai(w) if callable(nilai) else nilai)
+        mulai = time.perf_counter()
+        at.run()
+        waktu.append(time.perf_counter() - mulai)
+        if at.exception:
+            raise RuntimeError(f"{halaman} {tahap}: {at.exception[0].message}")
+    return waktu[0], waktu[-1]
+
+
+def _tahap_filter_dashboard(filter_aktif):
+    wilayah, bulan, kecamatan, kelurahan, tahun = [
+        ("selectbox", label, nilai) for label, nilai in zip(SIDEBAR_DASHBOARD, filter_aktif)
+    ]
+    return [[wilayah, bulan, tahun], [kecamatan], [kelurahan]]
+
+
+def _pilihan_dataframe(filter_aktif):
+    # {kolom: [nilai]} untuk elemen filter yang bukan "Semua ..."
+    from agregasi import SEMUA_BULAN, SEMUA_KECAMATAN, SEMUA_KELURAHAN, SEMUA_TAHUN, SEMUA_WILAYAH
+
+    semua = [SEMUA_WILAYAH, SEMUA_BULAN, SEMUA_KECAMATAN, SEMUA_KELURAHAN, SEMUA_TAHUN]
+    return {col: [nilai] for col, nilai, s in zip(KOLOM_DATAFRAME, filter_aktif, semua) if nilai != s}
+
+
+def _tahap_filter_dataframe(filter_aktif):
+    pilih = _pilihan_dataframe(filter_aktif)
+
+    def atur(kolom):
+        return [("multiselect", f"Filter kolom '{col}'", pilih[col]) for col in kolom if col in pilih]
+
+    return [atur(["wilayah_adm", "bulan", "tahun"]), atur(["kecamatan"]), atur(["kelurahan"])]
+
+
+def _varian_dashboard(penuh):
+    # Setiap kombinasi widget (penuh) atau satu widget diubah dari nilai awal
+    if penuh:
+        return [
+            [(jenis, nama, nilai) for (jenis, nama, _), nilai in zip(WIDGET_DASHBOARD, kombinasi)]
+            for kombinasi in itertools.product(*(opsi for _, _, opsi in WIDGET_DASHBOARD))
+        ]
+    return [[]] + [[(jenis, nama, nilai)] for jenis, nama, opsi in WIDGET_DASHBOARD for nilai in opsi[1:]]
+
+
+def _varian_dataframe(kolom, kata):
+    # Pencarian, pengurutan tiap kolom naik/turun, ukuran halaman, dan halaman terakhir
+    from tabel import UKURAN_HALAMAN
+
+    varian = [[]]
+    varian += [[[("text_input", "🔍 Cari", k)]] for k in kata]
+    varian += [
+        [[("selectbox", "Urutkan berdasarkan", col), ("radio", "Arah", arah)]]
+        for col in kolom for arah in ["Naik", "Turun"]
+    ]
+    varian += [[[("selectbox", "Baris per halaman", ukuran)]] for ukuran in UKURAN_HALAMAN[1:]]
+    varian += [[[], [("number_input", "Halaman", lambda w: int(w.max))]]]
+    return varian
+
+
+def _kosongkan_cache():
+    # Cache proses yang diisi oleh rerun halaman; run berikutnya menjadi cold
+    import agregasi
+    import data_loader
+    import grafik
+
+    data_loader.clear_cache()
+    agregasi.cube_clear()
+    grafik.figur_clear()
+
+
+def bench_halaman(matriks, penuh):
+    """Waktu rerun halaman untuk setiap filter di `matriks` dikombinasikan
+    dengan widget halaman (semua kombinasi jika `penuh`; selain itu satu
+    widget diubah pada filter pertama). Cold = render pertama setelah cache
+    proses dikosongkan."""
+    from data_loader import load_banjir
+    from indeks import indeks_filter
+
+    hasil = {}
+
+    # Dashboard: filter sidebar x selectbox level, periode tren, mode peta
+    varian = _varian_dashboard(penuh)
+    kombinasi = [(f, v) for f in matriks for v in (varian if penuh else [[]])]
+    if not penuh:
+        kombinasi += [(matriks[0], v) for v in varian[1:]]
+    _kosongkan_cache()
+    waktu = []
+    for filter_aktif, widget in kombinasi:
+        tahap = _tahap_filter_dashboard(filter_aktif)
+        tahap[-1] = tahap[-1] + widget
+        pertama, terakhir = _jalankan("3_Dashboard.py", tahap)
+        waktu.append(pertama if not waktu else terakhir)
+    hasil["3_Dashboard"] = _ringkas_waktu(waktu)
+
+    # DataFrame: filter multiselect x pencarian, pengurutan, ukuran/nomor halaman;
+    # filter dengan nilai yang tidak ada di data (mis. bulan tanpa kejadian)
+    # tidak bisa dipilih di multiselect sehingga dilewati
+    df = load_banjir()
+    opsi = indeks_filter(KOLOM_DATAFRAME).opsi
+    matriks = [f for f in matriks if all(
+        nilai in opsi.get(col, ()) for col, [nilai] in _pilihan_dataframe(f).items()
+    )]
+    kata = ["Jakarta", str(df["kecamatan"].iloc[0]), "tidak ada hasil"]
+    varian = _varian_dataframe(list(df.columns), kata)
+    kombinasi = [(f, v) for f in matriks for v in (varian if penuh else [[]])]
+    if not penuh:
+        kombinasi += [(matriks[0], v) for v in varian[1:]]
+    _kosongkan_cache()
+    waktu = []
+    for filter_aktif, tabel in kombinasi:
+        tahap = _tahap_filter_dataframe(filter_aktif)
+        if tabel:
+            tahap = tahap[:-1] + [tahap[-1] + tabel[0]] + tabel[1:]
+        pertama, terakhir = _jalankan("2_DataFrame.py", tahap)
+        waktu.append(pertama if not waktu else terakhir)
+    hasil["2_DataFrame"] = _ringkas_waktu(waktu)
+    return hasil
+
+
+def _ringkas_waktu(waktu):
+    return {
+        "n": len(waktu),
+        "cold_ms": waktu[0] * 1000,
+        "warm_median_ms": statistics.median(waktu[1:] or waktu) * 1000,
+        "max_ms": max(waktu) * 1000,
+    }
+
+
+def _matriks(mode):
+    """Tuple filter (wilayah, bulan, kecamatan, kelurahan, tahun). Selain
+    `default`: wilayah x bulan x tahun (dimulai dari filter terluas, semua
+    tahun), ditambah drill-down setiap kecamatan dan satu kelurahan per
+    kecamatan (semua bulan, tahun terbaru)."""
+    from agregasi import (
+        SEMUA_BULAN, SEMUA_KECAMATAN, SEMUA_KELURAHAN, SEMUA_TAHUN, SEMUA_WILAYAH, daftar_tahun,
+    )
+    from data_loader import BULAN_ORDER
+    from indeks import hierarki_wilayah
+
+    terbaru = daftar_tahun()[-1]
+    if mode == "default":
+        return [(SEMUA_WILAYAH, SEMUA_BULAN, SEMUA_KECAMATAN, SEMUA_KELURAHAN, terbaru)]
+    hierarki = hierarki_wilayah()
+    matriks = [
+        (wilayah, bulan, SEMUA_KECAMATAN, SEMUA_KELURAHAN, tahun)
+        for wilayah, bulan, tahun in itertools.product(
+            [SEMUA_WILAYAH] + hierarki.wilayah, [SEMUA_BULAN] + BULAN_ORDER, [SEMUA_TAHUN, terbaru]
+        )
+    ]
+    for wilayah in hierarki.wilayah:
+        for kecamatan in hierarki.kecamatan([wilayah]):
+            matriks.append((wilayah, SEMUA_BULAN, kecamatan, SEMUA_KELURAHAN, terbaru))
+            kelurahan = hierarki.kelurahan([wilayah], [kecamatan])
+            if kelurahan:
+                matriks.append((wilayah, SEMUA_BULAN, kecamatan, kelurahan[0], terbaru))
+    return matriks
+
+
+def worker(args):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    matriks = _matriks(args.matriks)
+    hasil = {"tahap": bench_tahap(matriks)}
+    if not args.tanpa_halaman:
+        hasil["halaman"] = bench_halaman(matriks, args.matriks == "penuh")
+    hasil["maxrss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(hasil))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skala", type=int, nargs="+", default=[1])
+    parser.add_argument("--matriks", choices=["default", "filter", "penuh"], default="filter",
+                        help="default: hanya filter awal; filter: wilayah x bulan x tahun + drill-down "
+                             "kecamatan/kelurahan, widget halaman diubah satu per satu; penuh: setiap "
+                             "filter x semua kombinasi widget halaman")
+    parser.add_argument("--tanpa-halaman", action="store_true", help="lewati pengukuran AppTest")
+    parser.add_argument("--output", help="simpan hasil lengkap sebagai JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    semua = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for skala in args.skala:
+            path = buat_dataset(skala, folder)
+            perintah = [sys.executable, os.path.abspath(__file__), "--worker", "--matriks", args.matriks]
+            if args.tanpa_halaman:
+                perintah.append("--tanpa-halaman")
+            keluaran = subprocess.run(
+                perintah, env={**os.environ, "BANJIR_CSV": path},
+                check=True, capture_output=True, text=True,
+            ).stdout
+            semua[skala] = hasil = json.loads(keluaran.strip().splitlines()[-1])
+
+            print(f"\n=== skala x{skala}: {hasil['tahap']['baris']:,} baris, "
+                  f"maxrss {hasil['maxrss_mb']:.0f} MB ===")
+            print(f"{'tahap':<28}{'n':>6}{'median ms':>12}{'max ms':>10}{'puncak MB':>11}{'payload KB':>12}")
+            for tahap, r in hasil["tahap"]["tahap"].items():
+                payload = r.get("payload_kb_max")
+                print(f"{tahap:<28}{r['n']:>6}{r['median_ms']:>12.2f}{r['max_ms']:>10.2f}"
+                      f"{r['puncak_mb']:>11.2f}{'' if payload is None else f'{payload:.1f}':>12}")
+            for halaman, r in hasil.get("halaman", {}).items():
+                print(f"rerun {halaman:<22}{r['n']:>6}  cold {r['cold_ms']:.0f} ms, "
+                      f"warm median {r['warm_median_ms']:.0f} ms, max {r['max_ms']:.0f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(semua, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Cache LRU sederhana yang aman dipakai bersama oleh banyak sesi (thread).
+
+    Selain batas jumlah entri, cache bisa dibatasi total ukurannya: `sizeof`
+    menghitung perkiraan ukuran (byte) setiap nilai saat disimpan, dan entri
+    paling lama tidak dipakai dibuang sampai total di bawah `max_bytes`."""
+
+    def __init__(self, max_entries, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()
+        self._ukuran = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hit = 0
+        self.miss = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hit += 1
+                return self._data[key]
+
+        # Hitung di luar lock; jika dua sesi bersamaan miss, hasil terakhir dipakai
+        value = compute()
+        ukuran = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            self.miss += 1
+            self._buang(key)
+            self._data[key] = value
+            self._ukuran[key] = ukuran
+            self._total_bytes += ukuran
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._total_bytes > self.max_bytes and len(self._data) > 1
+            ):
+                self._buang(next(iter(self._data)))
+        return value
+
+    def _buang(self, key):
+        if key in self._data:
+            del self._data[key]
+            self._total_bytes -= self._ukuran.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._ukuran.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hit": self.hit, "miss": self.miss,
+                "entries": len(self._data), "bytes": self._total_bytes,
+            }
@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# =====================
+# 📁 LOKASI FILE DATA
+# =====================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# BANJIR_CSV dapat menunjuk ke dataset lain (mis. dataset sintetis benchmark)
+DATA_CSV = os.environ.get("BANJIR_CSV", os.path.join(BASE_DIR, "banjir.csv"))
+# Salinan kolumnar dari CSV (hasil scripts/ingest_banjir.py); CSV tetap sumber utama
+DATA_KOLUMNAR = os.path.splitext(DATA_CSV)[0] + ".feather"
+GEOJSON_WILAYAH = os.path.join(BASE_DIR, "jakarta_geojson.json")
+GEOJSON_KECAMATAN = os.path.join(BASE_DIR, "kecamatan_geojson.json")
+
+# Hasil scripts/sederhanakan_geojson.py
+GEOJSON_TIER_DIR = os.path.join(BASE_DIR, "geojson_tier")
+
+# Hasil scripts/prerender_dashboard.py
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "snapshot")
+
+BULAN_ORDER = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+               'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
+
+# Tahun untuk data lama yang belum memiliki kolom `tahun` (dataset awal 2024)
+TAHUN_DEFAULT = 2024
+
+# Kolom teks dengan sedikit nilai unik disimpan sebagai kategori (dictionary)
+# dalam bentuk tampilan kanonik (Title Case)
+KOLOM_KATEGORI = ['bulan', 'wilayah_adm', 'kecamatan', 'kelurahan',
+                  'kelurahan_kecamatan_wilayah', 'kecamatan_wilayah']
+
+# Versi aturan tipe/normalisasi; salinan kolumnar dengan versi lain dianggap basi
+FORMAT_KOLUMNAR = "3"
+
+# =====================
+# 🗄️ CACHE PER PROSES
+# =====================
+# Setiap file hanya di-parse sekali per proses. Kunci cache adalah
+# (mtime_ns, ukuran) file, sehingga file yang diganti otomatis dibaca ulang.
+_cache = {}
+_lock = threading.Lock()
+_stats = {"hit": 0, "miss": 0}
+
+
+def _kunci_file(path):
+    info = os.stat(path)
+    return (info.st_mtime_ns, info.st_size)
+
+
+def _ambil(path, parser):
+    kunci = _kunci_file(path)
+    with _lock:
+        entri = _cache.get(path)
+        if entri is not None and entri[0] == kunci:
+            _stats["hit"] += 1
+            return entri[1]
+
+    # Parsing dilakukan di luar lock agar file lain tetap bisa dibaca
+    hasil = parser(path)
+    with _lock:
+        _stats["miss"] += 1
+        _cache[path] = (kunci, hasil)
+    return hasil
+
+
+# Hash isi file per (path, mtime_ns, ukuran): file yang sama tidak dibaca ulang
+# pada setiap pemeriksaan basi
+_hash = {}
+
+
+def sha1_file(path):
+    """Hash SHA-1 isi file (tidak bergantung pada mtime)."""
+    kunci = (path,) + _kunci_file(path)
+    with _lock:
+        if kunci in _hash:
+            return _hash[kunci]
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for blok in iter(lambda: f.read(1 << 20), b""):
+            h.update(blok)
+    with _lock:
+        _hash[kunci] = h.hexdigest()
+    return _hash[kunci]
+
+
+def _kategori_kanonik(series, urutan=None):
+    # Normalisasi dilakukan pada daftar kategori (puluhan nilai), bukan per baris.
+    # Nilai yang sama setelah Title Case digabung menjadi satu kategori.
+    # Jika `urutan` diberikan, hasilnya kategori berurutan dengan urutan tersebut.
+    cat = series.astype('category')
+    tampilan = cat.cat.categories.astype(str).str.strip().str.title()
+    categories = pd.Index(urutan if urutan is not None else tampilan.unique().sort_values())
+    kode_baru = categories.get_indexer(tampilan)
+    kode = cat.cat.codes.to_numpy()
+    kode = np.where(kode < 0, -1, kode_baru[kode])
+    return pd.Categorical.from_codes(kode, categories=categories, ordered=urutan is not None)
+
+
+def _tipe_kolumnar(df):
+    # Kategori kanonik untuk kolom teks dan integer sekecil mungkin untuk kolom
+    # hitungan. Kolom float (tinggi air) tetap float64 agar rata-rata tidak berubah.
+    df = df.copy()
+    if 'tahun' not in df.columns:
+        df.insert(0, 'tahun', TAHUN_DEFAULT)
+    for col in KOLOM_KATEGORI:
+        if col in df.columns:
+            df[col] = _kategori_kanonik(df[col], BULAN_ORDER if col == 'bulan' else None)
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def bangun_kolumnar(csv_path=DATA_CSV, out_path=DATA_KOLUMNAR):
+    """Konversi CSV ke file Feather (Arrow IPC) tanpa kompresi sehingga bisa
+    di-memory-map. Hash CSV sumber disimpan di metadata untuk deteksi basi."""
+    return tulis_kolumnar(_tipe_kolumnar(pd.read_csv(csv_path)), csv_path, out_path)
+
+
+def tulis_kolumnar(df, csv_path=DATA_CSV, out_path=DATA_KOLUMNAR, versi=FORMAT_KOLUMNAR):
+    """Tulis `df` (sudah bertipe seperti hasil `load_banjir`, atau tabel
+    turunannya seperti rollup) sebagai file kolumnar milik `csv_path` tanpa
+    mem-parse ulang CSV. Hash CSV dan `versi` format disimpan di metadata;
+    file diganti secara atomik sehingga pembaca lain tidak melihat file
+    setengah jadi."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"sumber_sha1"] = sha1_file(csv_path).encode()
+    metadata[b"format"] = versi.encode()
+    sementara = out_path + ".tmp"
+    feather.write_feather(table.replace_schema_metadata(metadata), sementara,
+                          compression="uncompressed")
+    os.replace(sementara, out_path)
+    return out_path
+
+
+def path_kolumnar(csv_path):
+    """Lokasi salinan kolumnar (Feather) untuk `csv_path`."""
+    return os.path.splitext(csv_path)[0] + ".feather"
+
+
+def path_rollup(csv_path):
+    """Lokasi rollup agregat tersimpan (Feather) untuk `csv_path`."""
+    return os.path.splitext(csv_path)[0] + ".rollup.feather"
+
+
+def _kolumnar_valid(csv_path, kolumnar_path, versi=FORMAT_KOLUMNAR):
+    if not os.path.exists(kolumnar_path):
+        return False
+    with pa.memory_map(kolumnar_path) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return (
+        metadata.get(b"format", b"").decode() == versi
+        and metadata.get(b"sumber_sha1", b"").decode() == sha1_file(csv_path)
+    )
+
+
+def baca_kolumnar(csv_path, kolumnar_path, versi=FORMAT_KOLUMNAR):
+    """Isi file kolumnar milik `csv_path` (hasil `tulis_kolumnar`), atau None
+    jika belum ada atau basi (hash CSV atau `versi` berbeda)."""
+    if not _kolumnar_valid(csv_path, kolumnar_path, versi):
+        return None
+    # Kolom numerik dipetakan langsung dari file (memory map) tanpa disalin
+    table = feather.read_table(kolumnar_path, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+def _baca_banjir(csv_path):
+    df = baca_kolumnar(csv_path, path_kolumnar(csv_path))
+    if df is not None:
+        return df
+    # Salinan kolumnar belum ada atau basi: baca CSV dengan tipe yang sama
+    return _tipe_kolumnar(pd.read_csv(csv_path))
+
+
+def _baca_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# =====================
+# 📥 API PUBLIK
+# =====================
+def load_banjir(path=DATA_CSV):
+    """Data kejadian banjir. Setiap pemanggil mendapat view dangkal (shallow)
+    sehingga penambahan/penggantian kolom tidak memengaruhi sesi lain; karena
+    Copy-on-Write pandas 3 (versi minimum di requirements.txt), perubahan nilai
+    di tempat pun hanya mengubah salinan milik pemanggil.
+
+    Kolom teks sudah berupa kategori kanonik (Title Case), `bulan` berupa
+    kategori berurutan sesuai BULAN_ORDER, dan `tahun` selalu ada (TAHUN_DEFAULT
+    untuk CSV lama tanpa kolom tahun). Gunakan `periode_bulan` untuk indeks
+    periode bulanan dan `kunci_geojson` untuk kunci huruf kapital yang dipakai
+    GeoJSON kecamatan."""
+    return _ambil(path, _baca_banjir).copy(deep=False)
+
+
+def _info_tier(path):
+    # Entri manifest tier untuk `path`, atau None jika belum dibangun/basi
+    manifest_path = os.path.join(GEOJSON_TIER_DIR, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return None
+    info = _ambil(manifest_path, _baca_json).get(os.path.basename(path))
+    if info is None or info.get("sumber_sha1") != sha1_file(path):
+        return None
+    return info
+
+
+def tier_geojson(path):
+    """File tier yang mungkin dipilih `path_geojson` untuk `path` (kosong jika
+    tier belum dibangun atau basi), mis. untuk kunci cache figur."""
+    info = _info_tier(path)
+    if info is None:
+        return []
+    daftar = [os.path.join(GEOJSON_TIER_DIR, tier["file"]) for tier in info["tier"]]
+    return [tier_path for tier_path in daftar if os.path.exists(tier_path)]
+
+
+def path_geojson(path, tinggi_peta=None, kotak=None):
+    """Pilih file GeoJSON untuk peta setinggi `tinggi_peta` piksel yang
+    menampilkan `kotak` (min_lon, min_lat, max_lon, max_lat; default seluruh
+    GeoJSON).
+
+    Tier yang dipilih adalah yang paling sederhana dengan toleransi tidak lebih
+    dari ukuran satu piksel pada rentang tersebut, sehingga penyederhanaan
+    tidak terlihat; peta yang diperbesar ke satu wilayah memakai tier lebih
+    detail. Jika tier belum dibangun, basi (hash file sumber berbeda dari
+    manifest), tidak ada yang cukup detail, atau tinggi tidak diberikan, file
+    asli dipakai."""
+    info = None if tinggi_peta is None else _info_tier(path)
+    if info is None:
+        return path
+
+    min_x, min_y, max_x, max_y = info["bbox"] if kotak is None else kotak
+    derajat_per_piksel = max(max_x - min_x, max_y - min_y) / tinggi_peta
+    cocok = [t for t in info["tier"] if t["toleransi"] <= derajat_per_piksel]
+    if not cocok:
+        return path
+    tier = max(cocok, key=lambda t: t["toleransi"])
+    tier_path = os.path.join(GEOJSON_TIER_DIR, tier["file"])
+    return tier_path if os.path.exists(tier_path) else path
+
+
+def load_geojson_wilayah(path=GEOJSON_WILAYAH, tinggi_peta=None):
+    """GeoJSON batas kota administrasi. Dict dibagi antar sesi dan tidak
+    dilindungi Copy-on-Write: jangan diubah (salin dulu jika perlu)."""
+    return _ambil(path_geojson(path, tinggi_peta), _baca_json)
+
+
+def load_geojson_kecamatan(path=GEOJSON_KECAMATAN, tinggi_peta=None, kotak=None):
+    """GeoJSON batas kecamatan (tier sesuai `path_geojson`). Dict dibagi antar
+    sesi dan tidak dilindungi Copy-on-Write: jangan diubah (salin dulu jika perlu)."""
+    return _ambil(path_geojson(path, tinggi_peta, kotak), _baca_json)
+
+
+def periode_bulan(tahun, bulan):
+    """PeriodIndex bulanan dari kolom `tahun` dan kategori `bulan`."""
+    bulan = pd.Categorical(bulan, categories=BULAN_ORDER)
+    return pd.PeriodIndex.from_fields(year=np.asarray(tahun), month=bulan.codes + 1, freq='M')
+
+
+def kunci_geojson(nilai):
+    """Kunci join GeoJSON (huruf kapital) untuk nilai kategori/teks tampilan."""
+    return pd.Index(nilai).astype(str).str.upper()
+
+
+def versi_data(path=DATA_CSV):
+    """Identitas versi file data, dipakai sebagai bagian kunci cache turunan."""
+    return (path,) + _kunci_file(path)
+
+
+def gabung_banjir(df, baru):
+    """`df` (hasil `load_banjir`) ditambah baris mentah `baru`, dengan tipe dan
+    kategori kanonik yang sama seperti jika seluruh CSV di-parse ulang."""
+    return _tipe_kolumnar(pd.concat([df, baru], ignore_index=True))
+
+
+def simpan_cache(path, df):
+    """Isi cache loader untuk versi `path` saat ini dengan `df` yang sudah
+    bertipe, mis. setelah penambahan data, agar tidak di-parse ulang."""
+    kunci = _kunci_file(path)
+    with _lock:
+        _cache[path] = (kunci, df)
+
+
+def cache_stats():
+    """Jumlah hit/miss cache loader sejak proses dimulai."""
+    with _lock:
+        return {**_stats, "files": len(_cache)}
+
+
+def clear_cache():
+    """Kosongkan cache loader (dipakai benchmark untuk mengukur cold start)."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,120 @@
+import tempfile
+import zlib
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+UKURAN_POTONGAN = 50_000
+
+# Nama format -> (ekstensi file, MIME type)
+FORMAT_EKSPOR = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+# =====================
+# 🧱 PENULIS BERTAHAP (GENERATOR)
+# =====================
+def _potongan(df, ukuran, posisi=None):
+    # Potongan baris berurutan; dengan `posisi` hanya baris pada posisi itu
+    # yang diambil per potongan (tanpa menyalin seluruh hasil filter dulu)
+    if posisi is None:
+        for awal in range(0, len(df), ukuran):
+            yield df.iloc[awal:awal + ukuran]
+    else:
+        for awal in range(0, len(posisi), ukuran):
+            yield df.iloc[posisi[awal:awal + ukuran]]
+
+
+def iter_csv(df, ukuran=UKURAN_POTONGAN, posisi=None):
+    """Isi CSV `df` (atau baris pada `posisi`) sebagai potongan bytes; hanya
+    satu potongan baris yang diubah menjadi teks pada satu waktu."""
+    yield df.iloc[:0].to_csv(index=False).encode("utf-8")
+    for potongan in _potongan(df, ukuran, posisi):
+        yield potongan.to_csv(index=False, header=False).encode("utf-8")
+
+
+def iter_gzip(potongan):
+    # wbits 31 = kontainer gzip (bisa dibuka gunzip / pandas compression='gzip')
+    kompresor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for bagian in potongan:
+        hasil = kompresor.compress(bagian)
+        if hasil:
+            yield hasil
+    yield kompresor.flush()
+
+
+class _Penampung:
+    # Sink file-like untuk ParquetWriter: bytes yang sudah ditulis diambil
+    # setelah tiap row group, posisi (tell) tetap dihitung dari awal file.
+    closed = False
+
+    def __init__(self):
+        self.potongan = []
+        self.posisi = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self.potongan.append(data)
+        self.posisi += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.posisi
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def ambil(self):
+        hasil, self.potongan = b"".join(self.potongan), []
+        return hasil
+
+
+def iter_parquet(df, ukuran=UKURAN_POTONGAN, posisi=None):
+    """Isi Parquet `df` (atau baris pada `posisi`) sebagai potongan bytes,
+    satu row group per potongan."""
+    sink = _Penampung()
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for potongan in _potongan(df, ukuran, posisi):
+            writer.write_table(pa.Table.from_pandas(potongan, schema=schema, preserve_index=False))
+            yield sink.ambil()
+    yield sink.ambil()
+
+
+def iter_ekspor(df, format_ekspor, ukuran=UKURAN_POTONGAN, posisi=None):
+    if format_ekspor == "CSV":
+        return iter_csv(df, ukuran, posisi)
+    if format_ekspor == "CSV (gzip)":
+        return iter_gzip(iter_csv(df, ukuran, posisi))
+    if format_ekspor == "Parquet":
+        return iter_parquet(df, ukuran, posisi)
+    raise ValueError(f"Format ekspor tidak dikenal: {format_ekspor}")
+
+
+# =====================
+# 📦 FILE UNDUHAN
+# =====================
+def data_ekspor(df, format_ekspor, posisi=None):
+    """Fungsi tanpa argumen untuk `st.download_button(data=...)`.
+
+    File baru dibuat saat tombol diklik (bukan pada setiap rerun). Potongan
+    hasil `iter_ekspor` ditulis ke file sementara di disk dan file yang sudah
+    dibuka dikembalikan, sehingga di memori hanya ada satu salinan isi file:
+    bytes yang dibaca Streamlit dari file tersebut untuk disajikan. Hasil tidak
+    di-cache; setiap klik membuat file baru. `posisi` (opsional) adalah fungsi
+    tanpa argumen yang mengembalikan posisi baris `df` yang diekspor."""
+    def buat():
+        # Tanpa buffer: potongan sudah besar, dan objek FileIO (RawIOBase)
+        # adalah tipe file yang diterima download_button
+        berkas = tempfile.TemporaryFile(buffering=0)
+        for bagian in iter_ekspor(df, format_ekspor, posisi=None if posisi is None else posisi()):
+            berkas.write(bagian)
+        berkas.seek(0)
+        return berkas
+    return buat
@@ -0,0 +1,566 @@
+import json
+import os
+
+import numpy as np
+import plotly
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from agregasi import (
+    FREKUENSI_TREN, SEMUA_BULAN, SEMUA_KECAMATAN, SEMUA_KELURAHAN, SEMUA_TAHUN, SEMUA_WILAYAH,
+    agregat_dashboard, agregat_tren, baris_dashboard,
+)
+from cache_lru import LRUCache
+from data_loader import (
+    BASE_DIR, DATA_CSV, GEOJSON_KECAMATAN, GEOJSON_WILAYAH, SNAPSHOT_DIR,
+    load_geojson_kecamatan, load_geojson_wilayah, sha1_file, tier_geojson, versi_data,
+)
+from instrumentasi import tahap
+from spasial import indeks_kecamatan, indeks_wilayah
+
+TINGGI_PETA = 350
+
+# Jarak tepi peta, proporsi dari rentang kotak batas fitur yang ditampilkan
+MARGIN_PETA = 0.03
+
+# Anggaran titik scatter pengungsi (env BANJIR_BATAS_TITIK); di atasnya baris
+# dikelompokkan per sel grid. Di bawahnya plotly express sudah memakai WebGL
+# (scattergl) untuk lebih dari 1000 baris.
+BATAS_TITIK = int(os.environ.get("BANJIR_BATAS_TITIK", 20_000))
+
+
+def _rentang_peta(indeks, nama):
+    # Kotak yang ditampilkan peta: bbox per fitur yang sudah dihitung sekali
+    # (spasial.py) ditambah margin
+    min_x, min_y, max_x, max_y = indeks.kotak(nama)
+    pad = MARGIN_PETA * max(max_x - min_x, max_y - min_y)
+    return (min_x - pad, min_y - pad, max_x + pad, max_y + pad)
+
+
+def _atur_rentang(fig, kotak):
+    # Rentang peta eksplisit, menggantikan fitbounds="locations" yang membuat
+    # browser menelusuri semua koordinat poligon pada setiap render
+    min_x, min_y, max_x, max_y = kotak
+    fig.update_geos(lonaxis_range=[min_x, max_x], lataxis_range=[min_y, max_y])
+
+
+def _peta_titik(data, indeks, kolom, judul, wilayah=None):
+    # Mode ringan: satu titik per fitur pada centroid-nya, ukuran = jumlah kejadian
+    df_titik = data.merge(indeks.pusat.rename(columns={'name': kolom}), on=kolom)
+    fig = px.scatter_geo(
+        df_titik,
+        lon='lon',
+        lat='lat',
+        size='jumlah_kejadian' if df_titik['jumlah_kejadian'].max() > 0 else None,
+        color='jumlah_kejadian',
+        color_continuous_scale='OrRd',
+        hover_name=kolom,
+        hover_data={'lon': False, 'lat': False},
+        labels={'jumlah_kejadian': 'Jumlah Kejadian'},
+        height=TINGGI_PETA
+    )
+    # Konteks: garis batas 5 kota administrasi dari GeoJSON lokal. Peta dasar
+    # plotly (showland/showocean) tidak dipakai karena memicu unduhan topojson
+    # dunia dari CDN dan render poligon tambahan di perangkat lambat.
+    indeks_batas = indeks_wilayah()
+    fig.add_trace(go.Choropleth(
+        geojson=load_geojson_wilayah(),
+        featureidkey='properties.province',
+        locations=indeks_batas.nama,
+        z=np.zeros(len(indeks_batas.nama)),
+        colorscale=[[0, '#f2f2f2'], [1, '#f2f2f2']],
+        showscale=False,
+        marker_line_color='#bbbbbb',
+        hoverinfo='skip',
+    ))
+    fig.update_geos(visible=False)
+    if wilayah is None:
+        _atur_rentang(fig, _rentang_peta(indeks, df_titik[kolom]))
+    else:
+        _atur_rentang(fig, _rentang_peta(indeks_wilayah(), wilayah))
+    fig.update_layout(margin={"r":0,"t":30,"l":0,"b":0}, title=judul)
+    return fig
+
+
+# =====================
+# 📊 GRAFIK 1: BULAN & TRIWULAN
+# =====================
+def _fig_bulan(agregat, level):
+    # Bulanan (termasuk hover detail wilayah)
+    agg_bulan = agregat['bulan']
+
+    fig_bulan = px.line(agg_bulan, x='bulan', y='jumlah_kejadian', markers=True,
+                        labels={'jumlah_kejadian': 'Jumlah Kejadian', 'bulan': 'Bulan'})
+    fig_bulan.update_traces(
+        line=dict(color='teal', width=3),
+        hovertemplate='%{customdata[0]}<extra></extra>',
+        customdata=agg_bulan[['custom_hover']].values
+    )
+    fig_bulan.update_layout(title='Jumlah Kejadian Banjir per Bulan',
+                            template='plotly_white', height=350,
+                            xaxis_tickangle=-45)
+    return fig_bulan
+
+
+def _fig_triwulan(agregat, level):
+    agg_triwulan = agregat['triwulan']
+    fig_triwulan = px.line(agg_triwulan, x='triwulan', y='jumlah_kejadian', markers=True,
+                           labels={'jumlah_kejadian': 'Jumlah Kejadian', 'triwulan': 'Triwulan'})
+    fig_triwulan.update_traces(line=dict(color='steelblue', width=3))
+    fig_triwulan.update_layout(title='Jumlah Kejadian Banjir per Triwulan',
+                               template='plotly_white', height=350)
+    return fig_triwulan
+
+
+def _fig_tren(tren, level):
+    # Tren multi-tahun dari `agregat_tren` (level = Bulan/Triwulan/Tahun)
+    tren = tren[level]
+    fig_tren = px.line(tren, x='periode', y='jumlah_kejadian', markers=True,
+                       labels={'jumlah_kejadian': 'Jumlah Kejadian', 'periode': level})
+    fig_tren.update_traces(line=dict(color='darkorange', width=3))
+    fig_tren.update_layout(title=f'Tren Jumlah Kejadian Banjir per {level}',
+                           template='plotly_white', height=350,
+                           xaxis_tickangle=-45 if level == 'Bulan' else 0)
+    return fig_tren
+
+
+# =====================
+# 🌍 GRAFIK 2: PETA PERSEBARAN
+# =====================
+def _fig_peta_wilayah(agregat, level):
+    fig_wilayah = px.choropleth(
+        agregat['wilayah'],
+        geojson=load_geojson_wilayah(),
+        locations='wilayah_adm',
+        featureidkey='properties.province',
+        color='jumlah_kejadian',
+        color_continuous_scale="OrRd",
+        labels={'jumlah_kejadian': 'Jumlah Kejadian'},
+        height=TINGGI_PETA
+    )
+    fig_wilayah.update_geos(visible=False)
+    _atur_rentang(fig_wilayah, _rentang_peta(indeks_wilayah(), agregat['wilayah']['wilayah_adm']))
+    fig_wilayah.update_layout(margin={"r":0,"t":30,"l":0,"b":0}, title="Sebaran Kejadian Banjir per Wilayah")
+    return fig_wilayah
+
+
+def _fig_peta_wilayah_titik(agregat, level):
+    return _peta_titik(agregat['wilayah'], indeks_wilayah(), 'wilayah_adm',
+                       "Sebaran Kejadian Banjir per Wilayah")
+
+
+def _fig_peta_kecamatan(agregat, level):
+    return peta_kecamatan(agregat['kecamatan_map'], "Sebaran Kejadian Banjir per Kecamatan",
+                          wilayah=agregat['wilayah']['wilayah_adm'])
+
+
+def _fig_peta_kecamatan_titik(agregat, level):
+    return _peta_titik(agregat['kecamatan_map'], indeks_kecamatan(), 'name',
+                       "Sebaran Kejadian Banjir per Kecamatan", wilayah=agregat['wilayah']['wilayah_adm'])
+
+
+def peta_kecamatan(kecamatan_map, judul, wilayah=None):
+    """Choropleth kecamatan dari tabel `name`/`jumlah_kejadian` (mis. agregat
+    `kecamatan_map` atau `spasial.agregat_titik`). Jika `wilayah` diberikan,
+    peta diarahkan ke kotak batas wilayah tersebut."""
+    if wilayah is None:
+        kotak = _rentang_peta(indeks_kecamatan(), kecamatan_map['name'])
+    else:
+        kotak = _rentang_peta(indeks_wilayah(), wilayah)
+    # GeoJSON tier yang disederhanakan sesuai tinggi peta dan rentang yang ditampilkan
+    fig_kecamatan = px.choropleth(
+        kecamatan_map,
+        geojson=load_geojson_kecamatan(tinggi_peta=TINGGI_PETA, kotak=kotak),
+        locations='name',
+        featureidkey='properties.name',
+        color='jumlah_kejadian',
+        color_continuous_scale='OrRd',
+        labels={'jumlah_kejadian': 'Jumlah Kejadian'},
+        height=TINGGI_PETA
+    )
+    fig_kecamatan.update_geos(visible=False)
+    _atur_rentang(fig_kecamatan, kotak)
+    fig_kecamatan.update_layout(margin={"r":0,"t":30,"l":0,"b":0}, title=judul)
+    return fig_kecamatan
+
+
+# =====================
+# 📍 GRAFIK 3: 10 KECAMATAN / KELURAHAN
+# =====================
+def _fig_top_kejadian(agregat, level):
+    top10 = agregat['top_kejadian'][level]
+    kolom = level.lower()
+    fig_bar = px.bar(top10, x='jumlah_kejadian', y=kolom, orientation='h',
+                     color='jumlah_kejadian', color_continuous_scale='Blues',
+                     labels={'jumlah_kejadian': 'Jumlah Kejadian', kolom: level})
+    fig_bar.update_layout(title=f'10 {level} dengan Kejadian Banjir Terbanyak',
+                          template='plotly_white', height=350,
+                          yaxis={'categoryorder': 'total ascending'})
+    return fig_bar
+
+
+# =====================
+# 🌊 GRAFIK 4: Tinggi Air Rata-rata dan Maksimum
+# =====================
+def _fig_tinggi_air(agregat, level):
+    # Top 10 dengan tinggi air yang sudah dibulatkan (pembulatan_tinggi)
+    top10 = agregat['tinggi_air'][level]
+
+    if level == "Kecamatan":
+        kolom, hover_name = 'kecamatan', 'kecamatan_wilayah'
+        label_x = 'Tinggi Air Rata-rata (cm)'
+        title = '10 Kecamatan dengan Rata-Rata Tinggi Air Tertinggi'
+    else:
+        kolom, hover_name = 'kelurahan', 'kelurahan_kecamatan_wilayah'
+        label_x = 'Tinggi Air Rata-Rata (cm)'
+        title = '10 Kelurahan dengan Rata-rata Tinggi Air Tertinggi'
+
+    fig = px.bar(
+        top10,
+        x='tinggi_air_avg_bulat',
+        y=kolom,
+        orientation='h',
+        labels={'tinggi_air_avg_bulat': label_x, kolom: level},
+        color='tinggi_air_avg_bulat',
+        color_continuous_scale='Reds',
+        hover_name=hover_name,
+        hover_data={'tinggi_air_max_bulat': True}
+    )
+    fig.update_traces(
+        hovertemplate='<b>%{hovertext}</b><br>'
+                      'Tinggi Air Rata-rata (cm): %{x}<br>'
+                      'Tinggi Air Maksimum (cm): %{customdata[0]}<extra></extra>'
+    )
+    fig.update_layout(
+        title=title,
+        yaxis={'categoryorder': 'total ascending'},
+        height=350,
+        template='plotly_white',
+        xaxis_title='Tinggi Air Rata-rata (cm)',
+        yaxis_title=level
+    )
+    return fig
+
+
+# =====================
+# 🧭 GRAFIK 5: Jumlah Pengungsi per Wilayah (Pie Chart)
+# =====================
+def _fig_evakuasi(agregat, level):
+    # Total per wilayah, lengkap dengan detail bulanan untuk hover
+    evakuasi_summary = agregat['evakuasi']
+
+    fig = px.pie(
+        evakuasi_summary,
+        names='wilayah_adm',
+        values='jumlah_pengungsi',
+        color_discrete_sequence=['#1f3b57', '#295173', '#3d6c8d', '#5486a8', '#6da1c3'],
+        hover_data={'hover_text': True}
+    )
+    fig.update_traces(
+        hovertemplate='%{customdata[0]}<extra></extra>',
+        customdata=evakuasi_summary[['hover_text']].values,
+        textinfo='percent+label'
+    )
+    fig.update_layout(
+        height=350,
+        template='plotly_white',
+        showlegend=True
+    )
+    return fig
+
+
+# =====================
+# 🧍‍♂️ GRAFIK 6: Top 10 Kecamatan/Kelurahan dengan Jumlah Pengungsi Tertinggi
+# =====================
+def _fig_pengungsi(agregat, level):
+    df_plot = agregat['pengungsi'][level]
+    kolom = level.lower()
+
+    fig = px.bar(
+        df_plot,
+        x=kolom,
+        y='jumlah_pengungsi',
+        color='jumlah_pengungsi',
+        color_continuous_scale='Greens',
+        title=f'10 {level} dengan Jumlah Pengungsi Tertinggi',
+        labels={
+            kolom: level,
+            'jumlah_pengungsi': 'Total Jumlah Pengungsi'
+        },
+        hover_data={
+            'hover_text': True,
+            'jumlah_pengungsi': False,
+            kolom: False
+        }
+    )
+    fig.update_traces(
+        hovertemplate='%{customdata[0]}<extra></extra>'
+    )
+    fig.update_layout(
+        height=350,
+        template='plotly_white',
+        xaxis_tickangle=-30,
+        xaxis_title='Wilayah',
+        yaxis_title='Total Jumlah Pengungsi',
+        hoverlabel=dict(bgcolor="white", font_size=12, font_family="Arial")
+    )
+    return fig
+
+
+def _grid_scatter(df, x, y, warna, anggaran):
+    # Satu titik per (warna, sel grid x, sel grid y) di posisi rata-rata baris
+    # dalam sel; jumlah sel per sumbu dipilih agar total titik <= anggaran.
+    # Hitungan bulat dengan rentang kecil tetap persis (lebar sel minimal 1).
+    n_sel = max(int(np.sqrt(anggaran / max(df[warna].nunique(), 1))), 1)
+    sel = {}
+    for col in (x, y):
+        nilai = df[col].to_numpy(dtype='float64')
+        lebar = max((nilai.max() - nilai.min()) / n_sel, 1.0)
+        sel[col] = np.minimum(((nilai - nilai.min()) // lebar).astype('int64'), n_sel - 1)
+    hasil = (
+        df[[warna, x, y]].assign(_sel_x=sel[x], _sel_y=sel[y])
+        .groupby([warna, '_sel_x', '_sel_y'], observed=True)
+        .agg(**{x: (x, 'mean'), y: (y, 'mean'), 'jumlah_baris': (x, 'size')})
+        .reset_index()
+    )
+    return hasil.drop(columns=['_sel_x', '_sel_y'])
+
+
+def _fig_scatter(df, level):
+    # Baris hasil filter global (`baris_dashboard`); kolom hitungan disimpan
+    # sebagai integer kecil, di-upcast agar spec figur tetap int64
+    df = df.astype({col: 'int64' for col in ['jumlah_tempat_pengungsian', 'jumlah_pengungsi']})
+    labels = {
+        'jumlah_tempat_pengungsian': 'Jumlah Tempat Pengungsian',
+        'jumlah_pengungsi': 'Jumlah Pengungsi',
+        'wilayah_adm': 'Wilayah'
+    }
+    if len(df) > BATAS_TITIK:
+        # Mode agregat: ukuran payload dibatasi anggaran titik, bukan jumlah baris
+        grid = _grid_scatter(df, 'jumlah_tempat_pengungsian', 'jumlah_pengungsi', 'wilayah_adm', BATAS_TITIK)
+        fig3 = px.scatter(
+            grid,
+            x='jumlah_tempat_pengungsian',
+            y='jumlah_pengungsi',
+            color='wilayah_adm',
+            size='jumlah_baris',
+            labels={**labels, 'jumlah_baris': 'Jumlah Baris'},
+            render_mode='webgl',
+            title=f"{len(df):,} baris dikelompokkan menjadi {len(grid):,} titik",
+        )
+    else:
+        fig3 = px.scatter(
+            df,
+            x='jumlah_tempat_pengungsian',
+            y='jumlah_pengungsi',
+            color='wilayah_adm',
+            labels=labels,
+            hover_data=['kecamatan', 'kelurahan', 'bulan']
+        )
+    fig3.update_layout(
+        template='plotly_white',
+        height=350,
+        font=dict(family='Arial', size=12),
+        hoverlabel=dict(font_size=12, font_family='Arial'),
+    )
+    return fig3
+
+
+GRAFIK = {
+    'bulan': _fig_bulan,
+    'triwulan': _fig_triwulan,
+    'tren': _fig_tren,
+    'peta_wilayah': _fig_peta_wilayah,
+    'peta_kecamatan': _fig_peta_kecamatan,
+    'peta_wilayah_titik': _fig_peta_wilayah_titik,
+    'peta_kecamatan_titik': _fig_peta_kecamatan_titik,
+    'top_kejadian': _fig_top_kejadian,
+    'tinggi_air': _fig_tinggi_air,
+    'evakuasi': _fig_evakuasi,
+    'pengungsi': _fig_pengungsi,
+    'scatter': _fig_scatter,
+}
+
+# Grafik yang bergantung pada selectbox tingkat wilayah (Kecamatan/Kelurahan)
+# atau granularitas periode (tren)
+GRAFIK_BERLEVEL = {'top_kejadian', 'tinggi_air', 'pengungsi', 'tren'}
+
+# Grafik per baris: dibangun dari kolom KOLOM_BARIS baris hasil filter
+# (`baris_dashboard`), bukan dari cube `agregat_dashboard`
+GRAFIK_BARIS = {'scatter'}
+KOLOM_BARIS = ['jumlah_tempat_pengungsian', 'jumlah_pengungsi', 'wilayah_adm', 'kecamatan', 'kelurahan', 'bulan']
+
+# Grafik yang selalu mencakup seluruh periode (filter tahun/bulan diabaikan);
+# dibangun dari `agregat_tren`, bukan dari cube `agregat_dashboard`
+GRAFIK_SEMUA_PERIODE = {'tren'}
+
+# Pilihan awal selectbox level di Dashboard; snapshot pra-render memakai level ini
+LEVEL_DEFAULT = {
+    'top_kejadian': 'Kecamatan',
+    'tinggi_air': 'Kecamatan',
+    'pengungsi': 'Kecamatan',
+    'tren': next(iter(FREKUENSI_TREN)),
+}
+
+
+def kunci_figur(chart_id, wilayah=SEMUA_WILAYAH, bulan=SEMUA_BULAN,
+                kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN, tahun=SEMUA_TAHUN, level=None):
+    """(chart id, filter, level) setelah filter/level yang tidak dipakai
+    grafik tersebut dikosongkan; kombinasi dengan figur sama berkunci sama."""
+    if chart_id not in GRAFIK_BERLEVEL:
+        level = None
+    if chart_id in GRAFIK_SEMUA_PERIODE:
+        bulan, tahun = SEMUA_BULAN, SEMUA_TAHUN
+    return (chart_id, wilayah, bulan, kecamatan, kelurahan, tahun, level)
+
+
+def bangun_figur(chart_id, wilayah, bulan, kecamatan, kelurahan, tahun, level):
+    """Bangun figur langsung dari agregat (tanpa cache maupun snapshot)."""
+    if chart_id in GRAFIK_SEMUA_PERIODE:
+        return GRAFIK[chart_id](agregat_tren(wilayah, kecamatan, kelurahan), level)
+    if chart_id in GRAFIK_BARIS:
+        return GRAFIK[chart_id](baris_dashboard(KOLOM_BARIS, wilayah, bulan, kecamatan, kelurahan, tahun), level)
+    return GRAFIK[chart_id](agregat_dashboard(wilayah, bulan, kecamatan, kelurahan, tahun), level)
+
+
+# =====================
+# 🧊 SNAPSHOT PRA-RENDER
+# =====================
+# Versi format snapshot; snapshot dengan versi lain dianggap basi
+FORMAT_SNAPSHOT = "1"
+
+# Kode yang menentukan isi figur selain file data
+KODE_FIGUR = ['grafik.py', 'agregasi.py', 'hover.py', 'spasial.py', 'rekonsiliasi.py', 'data_loader.py']
+
+MANIFEST_SNAPSHOT = os.path.join(SNAPSHOT_DIR, "manifest.json")
+
+
+def _sumber_snapshot():
+    return [DATA_CSV, GEOJSON_WILAYAH, GEOJSON_KECAMATAN] + tier_geojson(GEOJSON_KECAMATAN) + [
+        os.path.join(BASE_DIR, nama) for nama in KODE_FIGUR
+    ]
+
+
+def versi_snapshot():
+    """Identitas isi figur: format snapshot, versi Plotly, dan hash isi file
+    data/kode sumber. Memakai hash (bukan mtime) agar snapshot tetap berlaku
+    setelah checkout atau deploy ulang file yang sama."""
+    return {
+        'format': FORMAT_SNAPSHOT,
+        'plotly': plotly.__version__,
+        'sumber': {os.path.relpath(path, BASE_DIR): sha1_file(path) for path in _sumber_snapshot()},
+    }
+
+
+def kunci_snapshot(kunci):
+    """Kunci teks manifest untuk hasil `kunci_figur` atau tuple filter."""
+    return json.dumps(list(kunci), ensure_ascii=False)
+
+
+def _baca_manifest():
+    with open(MANIFEST_SNAPSHOT, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    # Snapshot dari data/kode lain tidak dipakai; grafik dihitung langsung
+    return manifest if manifest.get('versi') == versi_snapshot() else None
+
+
+# Hash file sumber hanya dihitung ulang jika salah satu file berubah (mtime/ukuran)
+_manifest = LRUCache(max_entries=4)
+
+
+def _manifest_snapshot():
+    if not os.path.exists(MANIFEST_SNAPSHOT):
+        return None
+    kunci = tuple(versi_data(path) for path in [MANIFEST_SNAPSHOT] + _sumber_snapshot())
+    return _manifest.get_or_compute(kunci, _baca_manifest)
+
+
+def _figur_snapshot(kunci):
+    manifest = _manifest_snapshot()
+    nama = None if manifest is None else manifest['figur'].get(kunci_snapshot(kunci))
+    if nama is None:
+        return None
+    return pio.read_json(os.path.join(SNAPSHOT_DIR, nama))
+
+
+def kecamatan_tanpa_peta(wilayah=SEMUA_WILAYAH, bulan=SEMUA_BULAN,
+                         kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN, tahun=SEMUA_TAHUN):
+    """Daftar (kecamatan, jumlah kejadian) yang tidak tampil di peta
+    kecamatan; dari snapshot jika tersedia agar tidak perlu agregasi."""
+    filter_aktif = (wilayah, bulan, kecamatan, kelurahan, tahun)
+    manifest = _manifest_snapshot()
+    if manifest is not None:
+        hasil = manifest['tanpa_peta'].get(kunci_snapshot(filter_aktif))
+        if hasil is not None:
+            return [tuple(baris) for baris in hasil]
+    tanpa_peta = agregat_dashboard(*filter_aktif)['kecamatan_tanpa_peta']
+    return [(nama, int(jumlah)) for nama, jumlah in tanpa_peta.itertuples(index=False)]
+
+
+# =====================
+# 🗄️ CACHE FIGUR ANTAR SESI
+# =====================
+# Perkiraan byte per elemen array objek (pointer + objek str/angka Python kecil)
+_BYTE_OBJEK = 64
+
+# Perkiraan tetap per figur untuk layout dan template
+_BYTE_FIGUR = 8 * 1024
+
+# Properti trace yang berisi array data (selain itu hanya atribut gaya kecil)
+_PROPERTI_ARRAY = ['x', 'y', 'z', 'lat', 'lon', 'locations', 'customdata', 'text', 'hovertext']
+
+
+def _ukuran_array(nilai):
+    if isinstance(nilai, np.ndarray):
+        return nilai.size * _BYTE_OBJEK if nilai.dtype == object else nilai.nbytes
+    if isinstance(nilai, (list, tuple)):
+        return len(nilai) * _BYTE_OBJEK
+    return 0
+
+
+def _ukuran_figur(fig):
+    # Perkiraan memori dari ukuran array data per trace, tanpa serialisasi
+    # atau deepcopy figur (to_plotly_json ikut menyalin GeoJSON bersama)
+    total = _BYTE_FIGUR
+    for trace in fig.data:
+        for nama in _PROPERTI_ARRAY:
+            if nama in trace:
+                total += _ukuran_array(trace[nama])
+        if 'marker' in trace:
+            total += sum(_ukuran_array(trace.marker[nama]) for nama in ['size', 'color'] if nama in trace.marker)
+    return total
+
+
+_figur = LRUCache(max_entries=512, max_bytes=256 * 1024 * 1024, sizeof=_ukuran_figur)
+
+
+def figur(chart_id, wilayah=SEMUA_WILAYAH, bulan=SEMUA_BULAN,
+          kecamatan=SEMUA_KECAMATAN, kelurahan=SEMUA_KELURAHAN, tahun=SEMUA_TAHUN, level=None):
+    """Figur Plotly untuk satu grafik Dashboard.
+
+    Figur di-cache per (chart id, filter, level) dan dibagi antar sesi,
+    sehingga mengganti satu selectbox hanya membangun ulang grafik yang
+    terpengaruh. Saat cache kosong, figur dibaca dari snapshot pra-render
+    (scripts/prerender_dashboard.py) jika ada dan masih sesuai data; selain
+    itu dibangun dari agregat. Figur hasil cache tidak boleh diubah oleh
+    pemanggil."""
+    kunci = kunci_figur(chart_id, wilayah, bulan, kecamatan, kelurahan, tahun, level)
+    versi = (
+        versi_data(),
+        versi_data(GEOJSON_WILAYAH),
+        versi_data(GEOJSON_KECAMATAN),
+    ) + tuple(versi_data(path) for path in tier_geojson(GEOJSON_KECAMATAN))
+    with tahap('figur'):
+        return _figur.get_or_compute(
+            (kunci[0], versi) + kunci[1:],
+            lambda: _figur_snapshot(kunci) or bangun_figur(*kunci)
+        )
+
+
+def figur_stats():
+    return _figur.stats()
+
+
+def figur_clear():
+    _figur.clear()
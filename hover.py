@@ -0,0 +1,34 @@
+import pandas as pd
+
+# =====================
+# 💬 TEKS HOVER TERVEKTORISASI
+# =====================
+# Semua label hover dibangun dengan operasi string per kolom dan satu kali
+# groupby, bukan loop Python per baris, sehingga biayanya tetap linear
+# terhadap jumlah baris agregat.
+
+
+def teks(*bagian):
+    """Gabungkan potongan teks per baris. Setiap argumen boleh berupa string
+    konstan atau Series (angka dikonversi ke string)."""
+    hasil = None
+    for b in bagian:
+        if isinstance(b, pd.Series):
+            if pd.api.types.is_float_dtype(b):
+                b = b.astype('int64')
+            b = b.astype(str)
+        hasil = b if hasil is None else hasil + b
+    return hasil
+
+
+def gabung_per_grup(kepala, baris, kunci):
+    """Tambahkan baris detail ke teks kepala setiap grup.
+
+    `kepala` adalah Series teks berindeks kunci grup; `baris` adalah Series teks
+    detail (masing-masing sudah diawali pemisah) yang dikelompokkan menurut
+    `kunci` dengan urutan baris dipertahankan. Grup tanpa detail hanya berisi
+    teks kepala."""
+    if len(baris) == 0:
+        return kepala
+    detail = baris.groupby(kunci, observed=True, sort=False).agg(''.join)
+    return kepala + detail.reindex(kepala.index).fillna('')
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+from cache_lru import LRUCache
+from data_loader import load_banjir, versi_data
+
+# Batas memori bitmap per kolom; kolom dengan terlalu banyak nilai unik
+# (mis. kelurahan pada dataset besar) memakai daftar posisi baris saja
+BATAS_BITMAP = 16 * 1024 * 1024
+
+
+class IndeksFilter:
+    """Indeks terbalik nilai -> baris untuk filter multiselect.
+
+    Dibangun sekali per versi data. Untuk setiap kolom disimpan daftar opsi
+    (nilai yang ada, terurut), posisi baris per nilai, dan jika muat dalam
+    `batas_bitmap`, bitmap baris per nilai (np.packbits). Filter dihitung
+    sebagai OR bitmap nilai terpilih lalu AND antar kolom."""
+
+    def __init__(self, df, kolom, batas_bitmap=BATAS_BITMAP):
+        self.n = len(df)
+        self._n_byte = -(-self.n // 8)
+        self.opsi = {}
+        self._kode = {}
+        self._posisi = {}
+        self._bitmap = {}
+        self._ada = {}
+
+        for col in kolom:
+            if col not in df.columns:
+                continue
+            cat = df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype('category')
+            cat = cat.cat.remove_unused_categories()
+            nilai = list(cat.cat.categories)
+            kode = cat.cat.codes.to_numpy()
+
+            self.opsi[col] = sorted(nilai)
+            self._kode[col] = {v: i for i, v in enumerate(nilai)}
+
+            # Posisi baris per kode (format CSR); kode -1 (NaN) ada di slot pertama
+            urutan = np.argsort(kode, kind='stable')
+            batas = np.concatenate([[0], np.cumsum(np.bincount(kode + 1, minlength=len(nilai) + 1))])
+            self._posisi[col] = (urutan, batas)
+
+            if len(nilai) * self._n_byte <= batas_bitmap:
+                self._bitmap[col] = np.stack(
+                    [np.packbits(kode == k) for k in range(len(nilai))]
+                ) if nilai else np.zeros((0, self._n_byte), dtype=np.uint8)
+
+            # Bitmap baris non-NaN; None jika kolom tidak punya NaN
+            self._ada[col] = np.packbits(kode >= 0) if (kode < 0).any() else None
+
+    def _bitmap_nilai(self, col, kode_pilih):
+        # OR bitmap untuk sekumpulan kode
+        if col in self._bitmap:
+            if not kode_pilih:
+                return np.zeros(self._n_byte, dtype=np.uint8)
+            return np.bitwise_or.reduce(self._bitmap[col][kode_pilih], axis=0)
+        urutan, batas = self._posisi[col]
+        baris = np.zeros(self.n, dtype=bool)
+        for k in kode_pilih:
+            baris[urutan[batas[k + 1]:batas[k + 2]]] = True
+        return np.packbits(baris)
+
+    def mask_kolom(self, col, pilihan):
+        """Bitmap (packed) baris dengan `col` bernilai salah satu `pilihan`,
+        atau None jika pilihan mencakup semua baris."""
+        kode = self._kode[col]
+        kode_pilih = sorted({kode[v] for v in pilihan if v in kode})
+        ada = self._ada[col]
+        if len(kode_pilih) == len(kode):
+            return ada
+
+        # Jika lebih dari separuh nilai dipilih, hitung komplemennya (lebih sedikit OR)
+        if len(kode_pilih) > len(kode) / 2:
+            terpilih = set(kode_pilih)
+            mask = ~self._bitmap_nilai(col, [k for k in range(len(kode)) if k not in terpilih])
+            return mask if ada is None else mask & ada
+        return self._bitmap_nilai(col, kode_pilih)
+
+    def mask(self, pilihan):
+        """AND dari `mask_kolom` untuk setiap {kolom: nilai terpilih}."""
+        hasil = None
+        for col, nilai in pilihan.items():
+            mask = self.mask_kolom(col, nilai)
+            if mask is not None:
+                hasil = mask if hasil is None else hasil & mask
+        return hasil
+
+    def posisi(self, pilihan):
+        """Posisi baris (untuk `iloc`) yang lolos filter."""
+        mask = self.mask(pilihan)
+        if mask is None:
+            return np.arange(self.n)
+        return np.flatnonzero(np.unpackbits(mask, count=self.n))
+
+
+class HierarkiWilayah:
+    """Hierarki wilayah -> kecamatan -> kelurahan untuk opsi filter bertingkat.
+
+    Dibangun dari kategori kolom label `kecamatan_wilayah` dan
+    `kelurahan_kecamatan_wilayah` ("Kelurahan, Kecamatan, Wilayah"), sehingga
+    hanya nilai unik yang diproses, bukan setiap baris. Daftar anak disimpan
+    sudah terurut."""
+
+    def __init__(self, df):
+        kecamatan = {}
+        for label in _kategori_teramati(df['kecamatan_wilayah']):
+            kec, wil = label.rsplit(', ', 1)
+            kecamatan.setdefault(wil, set()).add(kec)
+
+        kelurahan = {}
+        for label in _kategori_teramati(df['kelurahan_kecamatan_wilayah']):
+            kel, kec, wil = label.rsplit(', ', 2)
+            kelurahan.setdefault((wil, kec), set()).add(kel)
+
+        self.wilayah = sorted(kecamatan)
+        self._kecamatan = {wil: sorted(anak) for wil, anak in kecamatan.items()}
+        self._kelurahan = {kunci: sorted(anak) for kunci, anak in kelurahan.items()}
+
+    def kecamatan(self, wilayah=None):
+        """Kecamatan di dalam `wilayah` (daftar nama; None = semua wilayah)."""
+        if wilayah is None:
+            wilayah = self.wilayah
+        return _gabung_terurut(self._kecamatan.get(wil, ()) for wil in wilayah)
+
+    def kelurahan(self, wilayah=None, kecamatan=None):
+        """Kelurahan di dalam `kecamatan` yang termasuk `wilayah`
+        (None = tanpa batasan pada tingkat tersebut)."""
+        if wilayah is None:
+            wilayah = self.wilayah
+        return _gabung_terurut(
+            self._kelurahan.get((wil, kec), ())
+            for wil in wilayah
+            for kec in (self._kecamatan.get(wil, ()) if kecamatan is None else kecamatan)
+        )
+
+
+def _kategori_teramati(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return [str(v) for v in series.cat.remove_unused_categories().cat.categories]
+    return [str(v) for v in series.dropna().unique()]
+
+
+def _gabung_terurut(daftar):
+    daftar = [anak for anak in daftar if anak]
+    if len(daftar) == 1:
+        return list(daftar[0])
+    return sorted(set().union(*daftar))
+
+
+_indeks = LRUCache(max_entries=4)
+_hierarki = LRUCache(max_entries=4)
+
+
+def indeks_filter(kolom):
+    """Indeks filter untuk data banjir aktif, dibangun sekali per versi data
+    dan dibagi antar sesi."""
+    kolom = tuple(kolom)
+    return _indeks.get_or_compute(
+        (versi_data(), kolom),
+        lambda: IndeksFilter(load_banjir(), kolom)
+    )
+
+
+def hierarki_wilayah():
+    """Hierarki wilayah untuk data banjir aktif, dibangun sekali per versi data."""
+    return _hierarki.get_or_compute(versi_data(), lambda: HierarkiWilayah(load_banjir()))
@@ -0,0 +1,140 @@
+import threading
+
+import pandas as pd
+
+from agregasi import gabung_rollup, hitung_rollup, rollup_data, simpan_rollup
+from data_loader import (
+    BULAN_ORDER, DATA_CSV,
+    gabung_banjir, load_banjir, path_kolumnar, simpan_cache, tulis_kolumnar,
+)
+
+# Label gabungan yang boleh tidak disertakan; dibentuk dari kolom nama wilayah
+KOLOM_LABEL = {
+    'kecamatan_wilayah': ['kecamatan', 'wilayah_adm'],
+    'kelurahan_kecamatan_wilayah': ['kelurahan', 'kecamatan', 'wilayah_adm'],
+}
+
+# Satu proses hanya menjalankan satu penambahan data pada satu waktu
+_lock = threading.Lock()
+
+
+def _label(df, kolom):
+    hasil = df[kolom[0]].astype(str)
+    for col in kolom[1:]:
+        hasil = hasil + ", " + df[col].astype(str)
+    return hasil
+
+
+def validasi_kejadian(baru, acuan, tahun=None):
+    """Periksa baris baru terhadap skema `acuan` (hasil `load_banjir`).
+
+    Rilis bulanan tanpa kolom `tahun` bisa dilengkapi lewat `tahun`; jika
+    kolom itu ada, semua barisnya harus bernilai `tahun`.
+
+    Mengembalikan salinan `baru` dengan urutan kolom yang sama seperti CSV dan
+    angka yang sudah dikonversi; ValueError jika ada kolom yang hilang/asing,
+    angka tidak valid, bulan tidak dikenal, triwulan tidak sesuai bulan, atau
+    label gabungan tidak sesuai nama wilayah."""
+    baru = baru.copy()
+    if 'tahun' not in baru.columns:
+        if tahun is None:
+            raise ValueError("Kolom 'tahun' tidak ada; sebutkan tahun kejadian (argumen `tahun`)")
+        baru['tahun'] = tahun
+    elif tahun is not None and (pd.to_numeric(baru['tahun'], errors='coerce') != tahun).any():
+        raise ValueError(f"Kolom 'tahun' berisi nilai selain {tahun}")
+    for label, kolom in KOLOM_LABEL.items():
+        if label not in baru.columns and all(col in baru.columns for col in kolom):
+            baru[label] = _label(baru, kolom)
+
+    hilang = [col for col in acuan.columns if col not in baru.columns]
+    asing = [col for col in baru.columns if col not in acuan.columns]
+    if hilang or asing:
+        raise ValueError(f"Kolom tidak sesuai skema (hilang: {hilang}, asing: {asing})")
+    baru = baru[list(acuan.columns)].reset_index(drop=True)
+
+    for col in acuan.columns:
+        dtype = acuan[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            if baru[col].isna().any():
+                raise ValueError(f"Kolom '{col}' tidak boleh kosong")
+            baru[col] = baru[col].astype(str).str.strip()
+            continue
+
+        angka = pd.to_numeric(baru[col], errors='coerce')
+        if angka.isna().any():
+            raise ValueError(f"Kolom '{col}' berisi nilai kosong atau bukan angka")
+        if pd.api.types.is_integer_dtype(dtype):
+            if ((angka % 1) != 0).any() or (angka < 0).any():
+                raise ValueError(f"Kolom '{col}' harus berisi bilangan bulat tidak negatif")
+            angka = angka.astype('int64')
+        baru[col] = angka
+
+    bulan = baru['bulan'].str.title()
+    tidak_dikenal = sorted(set(bulan) - set(BULAN_ORDER))
+    if tidak_dikenal:
+        raise ValueError(f"Nama bulan tidak dikenal: {tidak_dikenal}")
+    triwulan = bulan.map({b: i // 3 + 1 for i, b in enumerate(BULAN_ORDER)})
+    if (triwulan != baru['triwulan']).any():
+        raise ValueError("Kolom 'triwulan' tidak sesuai dengan kolom 'bulan'")
+
+    for label, kolom in KOLOM_LABEL.items():
+        if (baru[label].str.title() != _label(baru, kolom).str.title()).any():
+            raise ValueError(f"Kolom '{label}' tidak sesuai dengan kolom {kolom}")
+    return baru
+
+
+def _tambah_csv(path, baru):
+    # CSV lama tanpa kolom `tahun` (atau kolom lain) tidak bisa ditambah baris
+    # secara langsung tanpa menulis ulang seluruh file
+    header = list(pd.read_csv(path, nrows=0).columns)
+    if header != list(baru.columns):
+        raise ValueError(f"Header {path} tidak sesuai skema saat ini: {header}")
+
+    # Pastikan baris baru tidak tersambung ke baris terakhir file
+    perlu_baris_baru = False
+    with open(path, "rb") as f:
+        if f.seek(0, 2) > 0:
+            f.seek(-1, 2)
+            perlu_baris_baru = f.read(1) != b"\n"
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        if perlu_baris_baru:
+            f.write("\n")
+        baru.to_csv(f, header=False, index=False)
+
+
+def tambah_kejadian(baru, path=DATA_CSV, tahun=None):
+    """Tambahkan baris kejadian banjir baru ke dataset dan perbarui turunannya.
+
+    Baris divalidasi (`validasi_kejadian`; kolom `tahun` dilengkapi dari
+    `tahun` bila tidak ada), ditambahkan di akhir CSV, lalu salinan kolumnar
+    ditulis ulang dari data di memori tanpa mem-parse CSV.
+    Rollup agregat diperbarui dari rollup lama + rollup baris baru saja dan
+    disimpan di samping salinan kolumnar (`simpan_rollup`), dengan hash CSV
+    baru. Proses lain (worker Streamlit) yang melihat versi file berubah
+    memetakan ulang salinan kolumnar (memory map) dan membaca rollup
+    tersimpan, tanpa parse CSV maupun rollup dari seluruh baris.
+
+    Yang tetap tidak sebanding dengan jumlah baris baru:
+    - `gabung_banjir` menyalin dan mengatur ulang tipe seluruh dataset, dan
+      salinan kolumnar ditulis ulang utuh (hanya di proses ingest);
+    - versi data berubah, sehingga indeks filter, hierarki wilayah, cube
+      agregat, figur dan cache tabel dibangun ulang saat pertama dipakai;
+    - snapshot pra-render menjadi basi sampai
+      `scripts/prerender_dashboard.py` dijalankan lagi.
+
+    Mengembalikan jumlah baris yang ditambahkan."""
+    with _lock:
+        lama = load_banjir(path)
+        rollup_lama = rollup_data(path)
+        baru = validasi_kejadian(baru, lama, tahun)
+        if baru.empty:
+            return 0
+
+        _tambah_csv(path, baru)
+        gabungan = gabung_banjir(lama, baru)
+        tulis_kolumnar(gabungan, path, path_kolumnar(path))
+        simpan_cache(path, gabungan)
+
+        delta = hitung_rollup(gabungan.iloc[len(lama):])
+        simpan_rollup(gabung_rollup(rollup_lama, delta), path)
+        return len(baru)
@@ -0,0 +1,142 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import time
+
+import pandas as pd
+import plotly.io as pio
+
+# Instrumentasi aktif untuk semua sesi jika env var ini bernilai 1/true/ya;
+# satu sesi bisa mengaktifkannya sendiri dengan query param ?instrumentasi=1
+ENV_INSTRUMENTASI = "BANJIR_INSTRUMENTASI"
+PARAM_INSTRUMENTASI = "instrumentasi"
+
+# File JSON Lines tambahan untuk hasil pengukuran (opsional, mis. untuk
+# dikirim ke sistem metrik); tanpa ini hasil hanya ditulis ke stderr
+ENV_LOG_INSTRUMENTASI = "BANJIR_INSTRUMENTASI_LOG"
+
+_NILAI_AKTIF = {"1", "true", "ya", "yes", "on"}
+
+_logger = logging.getLogger("banjir.instrumentasi")
+if not _logger.handlers:
+    _logger.addHandler(logging.StreamHandler())
+    if os.environ.get(ENV_LOG_INSTRUMENTASI):
+        _logger.addHandler(logging.FileHandler(os.environ[ENV_LOG_INSTRUMENTASI], encoding="utf-8"))
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
+
+# Pengukuran milik rerun yang sedang berjalan (per thread skrip Streamlit)
+_aktif = contextvars.ContextVar("pengukuran", default=None)
+
+
+def instrumentasi_aktif(query_params=None):
+    """True jika instrumentasi diaktifkan lewat env var atau query param."""
+    if os.environ.get(ENV_INSTRUMENTASI, "").strip().lower() in _NILAI_AKTIF:
+        return True
+    nilai = (query_params or {}).get(PARAM_INSTRUMENTASI, "")
+    return str(nilai).strip().lower() in _NILAI_AKTIF
+
+
+class Pengukuran:
+    """Waktu per (bagian, tahap) dan ukuran payload per grafik untuk satu
+    rerun halaman.
+
+    Waktu setiap tahap bersifat eksklusif: tahap yang berjalan di dalam tahap
+    lain (mis. agregasi di dalam pembangunan figur saat cache kosong) tidak
+    ikut dihitung pada tahap luarnya. Tahap yang dilewati karena cache hit
+    tidak muncul sama sekali."""
+
+    def __init__(self, halaman):
+        self.halaman = halaman
+        self.detik = {}
+        self.payload = {}
+        self._bagian = None
+        self._anak = []
+        self._mulai = time.perf_counter()
+        self.total = None
+
+    def tandai_bagian(self, nama):
+        self._bagian = nama
+
+    @contextlib.contextmanager
+    def tahap(self, nama):
+        self._anak.append(0.0)
+        mulai = time.perf_counter()
+        try:
+            yield
+        finally:
+            durasi = time.perf_counter() - mulai
+            anak = self._anak.pop()
+            if self._anak:
+                self._anak[-1] += durasi
+            kunci = (self._bagian, nama)
+            self.detik[kunci] = self.detik.get(kunci, 0.0) + durasi - anak
+
+    def catat_payload(self, chart_id, fig):
+        # Perkiraan payload: spec JSON yang dikirim st.plotly_chart ke browser
+        self.payload[(self._bagian, chart_id)] = len(pio.to_json(fig, validate=False))
+
+    def tabel(self):
+        """DataFrame waktu (ms) per bagian x tahap ditambah payload (KB)."""
+        baris = {}
+        for (bagian, nama), detik in self.detik.items():
+            baris.setdefault(bagian, {})[nama] = detik * 1000
+        for (bagian, _), ukuran in self.payload.items():
+            baris.setdefault(bagian, {})
+            baris[bagian]['payload_kb'] = baris[bagian].get('payload_kb', 0.0) + ukuran / 1024
+        return pd.DataFrame.from_dict(baris, orient='index').fillna(0.0).round(1)
+
+    def selesai(self):
+        """Tutup pengukuran dan tulis hasilnya sebagai satu baris JSON ke log."""
+        self.total = time.perf_counter() - self._mulai
+        if _aktif.get() is self:
+            _aktif.set(None)
+        _logger.info(json.dumps({
+            "halaman": self.halaman,
+            "total_ms": round(self.total * 1000, 2),
+            "tahap": [
+                {"bagian": bagian, "tahap": nama, "ms": round(detik * 1000, 2)}
+                for (bagian, nama), detik in self.detik.items()
+            ],
+            "payload_bytes": [
+                {"bagian": bagian, "grafik": chart_id, "bytes": ukuran}
+                for (bagian, chart_id), ukuran in self.payload.items()
+            ],
+        }, ensure_ascii=False))
+
+
+def mulai_pengukuran(halaman, aktif):
+    """Pengukuran baru untuk rerun ini (None jika tidak aktif). Tahap yang
+    ditandai dengan `tahap()` di modul lain tercatat ke pengukuran ini."""
+    pengukuran = Pengukuran(halaman) if aktif else None
+    _aktif.set(pengukuran)
+    return pengukuran
+
+
+def tandai_bagian(nama):
+    """Mulai bagian halaman baru (mis. satu grafik); tahap berikutnya dicatat
+    di bagian ini sampai bagian lain ditandai."""
+    pengukuran = _aktif.get()
+    if pengukuran is not None:
+        pengukuran.tandai_bagian(nama)
+
+
+@contextlib.contextmanager
+def tahap(nama):
+    """Ukur waktu satu tahap (load/filter/agregasi/figur/serialisasi); tanpa
+    pengukuran aktif hanya berupa satu lookup ContextVar."""
+    pengukuran = _aktif.get()
+    if pengukuran is None:
+        yield
+        return
+    with pengukuran.tahap(nama):
+        yield
+
+
+def catat_payload(chart_id, fig):
+    """Catat ukuran payload figur jika pengukuran aktif."""
+    pengukuran = _aktif.get()
+    if pengukuran is not None:
+        pengukuran.catat_payload(chart_id, fig)
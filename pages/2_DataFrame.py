@@ -1,5 +1,9 @@
 import streamlit as st
-import pandas as pd
+
+from data_loader import load_banjir
+from ekspor import FORMAT_EKSPOR, data_ekspor
+from indeks import hierarki_wilayah, indeks_filter
+from tabel import UKURAN_HALAMAN, ambil_halaman, jumlah_halaman, urutan_baris
 
 st.title("Halaman DataFrame")
 st.write("Halaman ini menampilkan informasi sumber data serta data banjir yang telah melalui proses pembersihan (cleaning).")
@@ -12,30 +16,94 @@ Dataset yang digunakan berisi informasi mengenai kejadian banjir di wilayah Prov
 🔗 [Tautan Sumber Dataset](https://satudata.jakarta.go.id/open-data/detail?kategori=dataset&page_url=data-kejadian-bencana-banjir&data_no=1)
 """)
 
-df = pd.read_csv("banjir.csv")
+df = load_banjir()
 
 st.sidebar.header("🔎 Filter Data")
 
-filter_columns = ['bulan', 'wilayah_adm', 'kecamatan', 'kelurahan']
-filtered_df = df.copy()
+filter_columns = ['tahun', 'bulan', 'wilayah_adm', 'kecamatan', 'kelurahan']
+# Opsi dan bitmap baris per nilai dibangun sekali per versi data (lihat indeks.py)
+indeks = indeks_filter(filter_columns)
+pilihan = {}
+pilihan_filter = []
+
+# Opsi kecamatan/kelurahan mengikuti pilihan di atasnya (lihat HierarkiWilayah)
+hierarki = hierarki_wilayah()
+
+
+def opsi_bertingkat(col):
+    if col == 'kecamatan' and 'wilayah_adm' in pilihan:
+        return hierarki.kecamatan(pilihan['wilayah_adm'])
+    if col == 'kelurahan' and 'wilayah_adm' in pilihan:
+        return hierarki.kelurahan(pilihan['wilayah_adm'], pilihan.get('kecamatan'))
+    return indeks.opsi[col]
+
 
 for col in filter_columns:
-    if col in df.columns:
-        unique_values = df[col].dropna().unique()
-        selected_values = st.sidebar.multiselect(f"Filter kolom '{col}'", sorted(unique_values), default=sorted(unique_values))
-        filtered_df = filtered_df[filtered_df[col].isin(selected_values)]
+    if col in indeks.opsi:
+        opsi_kolom = opsi_bertingkat(col)
+        selected_values = st.sidebar.multiselect(f"Filter kolom '{col}'", opsi_kolom, default=opsi_kolom)
+        pilihan[col] = selected_values
+        pilihan_filter.append((col, tuple(selected_values)))
+
+# Kunci yang mengidentifikasi hasil filter (dipakai cache urutan & halaman).
+# Posisi baris hasil filter hanya dihitung saat belum ada di cache; tabel dan
+# unduhan mengambil baris langsung dari `df` lewat posisi tersebut.
+kunci_filter = tuple(pilihan_filter)
+
+
+def posisi_filter():
+    return indeks.posisi(pilihan)
+
+
+# =====================
+# 📄 TABEL BERHALAMAN
+# =====================
+# Pencarian dan pengurutan dihitung di server; hanya baris pada halaman aktif
+# yang dikirim ke browser.
+col_cari, col_urut, col_arah = st.columns([2, 2, 1])
+with col_cari:
+    kata_kunci = st.text_input("🔍 Cari", placeholder="Nama wilayah, kecamatan, kelurahan, bulan...")
+with col_urut:
+    kolom_urut = st.selectbox("Urutkan berdasarkan", ["(urutan asli)"] + list(df.columns))
+with col_arah:
+    arah = st.radio("Arah", ["Naik", "Turun"], horizontal=True)
+
+posisi = urutan_baris(
+    df, kunci_filter, posisi_filter, kata_kunci,
+    None if kolom_urut == "(urutan asli)" else kolom_urut,
+    arah == "Naik"
+)
 
-st.dataframe(filtered_df, use_container_width=True)
+col_ukuran, col_halaman, col_info = st.columns([1, 1, 2])
+with col_ukuran:
+    ukuran_halaman = st.selectbox("Baris per halaman", UKURAN_HALAMAN)
+total_halaman = jumlah_halaman(len(posisi), ukuran_halaman)
+with col_halaman:
+    nomor_halaman = st.number_input("Halaman", min_value=1, max_value=total_halaman, value=1, step=1)
+with col_info:
+    awal = (nomor_halaman - 1) * ukuran_halaman
+    st.caption(
+        f"Menampilkan baris {min(awal + 1, len(posisi))}–{min(awal + ukuran_halaman, len(posisi))} "
+        f"dari {len(posisi)} baris hasil filter (halaman {nomor_halaman} dari {total_halaman})"
+    )
 
-@st.cache_data
-def convert_df(data):
-    return data.to_csv(index=False).encode('utf-8')
+st.dataframe(ambil_halaman(df, posisi, nomor_halaman, ukuran_halaman), width="stretch")
 
-csv_data = convert_df(filtered_df)
+# =====================
+# 📥 UNDUH DATA
+# =====================
+# File dibuat bertahap (per potongan baris) di file sementara hanya saat
+# tombol diklik (lihat ekspor.py).
+col_format, col_unduh = st.columns([1, 2])
+with col_format:
+    format_unduh = st.selectbox("Format unduhan", list(FORMAT_EKSPOR))
+ekstensi, mime = FORMAT_EKSPOR[format_unduh]
 
-st.download_button(
-    label="📥 Download Dataset (Sesuai Filter)",
-    data=csv_data,
-    file_name='banjir_filtered.csv',
-    mime='text/csv'
-)
\ No newline at end of file
+with col_unduh:
+    st.download_button(
+        label="📥 Download Dataset (Sesuai Filter)",
+        data=data_ekspor(df, format_unduh, posisi=lambda: urutan_baris(df, kunci_filter, posisi_filter)),
+        file_name=f'banjir_filtered.{ekstensi}',
+        mime=mime,
+        on_click="ignore"
+    )
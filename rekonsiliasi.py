@@ -0,0 +1,78 @@
+import difflib
+import re
+
+import numpy as np
+import pandas as pd
+
+from cache_lru import LRUCache
+
+# Ambang kemiripan difflib (0-1) untuk pencocokan fuzzy
+AMBANG_FUZZY = 0.85
+
+# Singkatan yang diperluas sebelum nama dibandingkan
+SINGKATAN = {'KEP': 'KEPULAUAN', 'KEC': 'KECAMATAN', 'KEL': 'KELURAHAN', 'JKT': 'JAKARTA'}
+
+
+def normalisasi_nama(nama):
+    """Kunci kanonik nama wilayah: huruf kapital, singkatan diperluas, tanpa
+    spasi/tanda baca (mis. "Kali Deres" dan "KALIDERES" -> "KALIDERES")."""
+    kata = re.findall(r'[A-Z0-9]+', str(nama).upper())
+    return ''.join(SINGKATAN.get(k, k) for k in kata)
+
+
+class IndeksNama:
+    """Pemetaan nama di data ke fitur GeoJSON, dibangun sekali per pasangan
+    daftar nama.
+
+    Setiap nama dicocokkan berurutan: persis (huruf kapital), kunci kanonik
+    (`normalisasi_nama`), lalu fuzzy (difflib) di atas kunci kanonik. Hasilnya
+    berupa array posisi fitur per nama sehingga join menjadi lookup array."""
+
+    def __init__(self, nama_data, nama_geojson, ambang=AMBANG_FUZZY):
+        self.nama_data = list(nama_data)
+        self.nama_geojson = list(nama_geojson)
+
+        persis = {nama: i for i, nama in enumerate(self.nama_geojson)}
+        kanonik = {}
+        for i, nama in enumerate(self.nama_geojson):
+            kanonik.setdefault(normalisasi_nama(nama), []).append(i)
+        # Kunci kanonik yang dipakai lebih dari satu fitur tidak bisa dipakai
+        kanonik = {kunci: posisi[0] for kunci, posisi in kanonik.items() if len(posisi) == 1}
+
+        self.posisi_fitur = np.full(len(self.nama_data), -1, dtype='int64')
+        self.metode = [None] * len(self.nama_data)
+        for i, nama in enumerate(self.nama_data):
+            kunci = str(nama).upper()
+            if kunci in persis:
+                self.posisi_fitur[i], self.metode[i] = persis[kunci], 'persis'
+                continue
+            kunci = normalisasi_nama(nama)
+            if kunci in kanonik:
+                self.posisi_fitur[i], self.metode[i] = kanonik[kunci], 'normalisasi'
+                continue
+            mirip = difflib.get_close_matches(kunci, list(kanonik), n=1, cutoff=ambang)
+            if mirip:
+                self.posisi_fitur[i], self.metode[i] = kanonik[mirip[0]], 'fuzzy'
+
+    def laporan(self):
+        """Tabel pencocokan per nama data, diikuti fitur GeoJSON yang tidak
+        mendapat pasangan (kolom `nama_data` kosong)."""
+        fitur = [self.nama_geojson[p] if p >= 0 else None for p in self.posisi_fitur]
+        tabel = pd.DataFrame({'nama_data': self.nama_data, 'fitur_geojson': fitur, 'metode': self.metode})
+        tanpa_data = sorted(set(self.nama_geojson) - set(f for f in fitur if f is not None))
+        return pd.concat([
+            tabel,
+            pd.DataFrame({'nama_data': None, 'fitur_geojson': tanpa_data, 'metode': None}),
+        ], ignore_index=True)
+
+
+_indeks = LRUCache(max_entries=8)
+
+
+def indeks_nama(nama_data, nama_geojson):
+    """IndeksNama yang di-cache per (daftar nama data, daftar nama fitur)."""
+    nama_data, nama_geojson = tuple(nama_data), tuple(nama_geojson)
+    return _indeks.get_or_compute(
+        (nama_data, nama_geojson),
+        lambda: IndeksNama(nama_data, nama_geojson)
+    )
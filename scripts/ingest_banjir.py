@@ -0,0 +1,24 @@
+"""Konversi banjir.csv ke format kolumnar (banjir.feather).
+
+Jalankan dari root repo setiap kali banjir.csv diperbarui:
+
+    python scripts/ingest_banjir.py
+
+CSV tetap menjadi sumber utama. data_loader.py hanya memakai file Feather jika
+hash CSV yang tercatat di dalamnya masih sama dengan CSV saat ini; jika tidak,
+CSV dibaca langsung. Rollup agregat (banjir.rollup.feather) ikut ditulis
+dengan aturan yang sama.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregasi import hitung_rollup, simpan_rollup  # noqa: E402
+from data_loader import DATA_CSV, DATA_KOLUMNAR, bangun_kolumnar, load_banjir  # noqa: E402
+
+if __name__ == "__main__":
+    bangun_kolumnar(DATA_CSV, DATA_KOLUMNAR)
+    simpan_rollup(hitung_rollup(load_banjir(DATA_CSV)), DATA_CSV)
+    print(f"{os.path.basename(DATA_CSV)}: {os.path.getsize(DATA_CSV):,} bytes -> "
+          f"{os.path.basename(DATA_KOLUMNAR)}: {os.path.getsize(DATA_KOLUMNAR):,} bytes")
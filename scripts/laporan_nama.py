@@ -0,0 +1,30 @@
+"""Laporan pencocokan nama kecamatan banjir.csv ke kecamatan_geojson.json.
+
+    python scripts/laporan_nama.py
+
+Menampilkan nama yang cocok lewat normalisasi/fuzzy (perlu dicek), nama data
+yang tidak punya fitur GeoJSON (kejadiannya tidak tampil di peta), dan fitur
+GeoJSON yang tidak punya data.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import load_banjir, load_geojson_kecamatan  # noqa: E402
+from rekonsiliasi import indeks_nama  # noqa: E402
+
+if __name__ == "__main__":
+    kecamatan = load_banjir()['kecamatan'].astype('category').cat.categories
+    fitur = [f['properties']['name'] for f in load_geojson_kecamatan()['features']]
+    laporan = indeks_nama(kecamatan, fitur).laporan()
+
+    bagian = [
+        ("Cocok lewat normalisasi/fuzzy", laporan['metode'].isin(['normalisasi', 'fuzzy'])),
+        ("Nama data tanpa fitur GeoJSON", laporan['nama_data'].notna() & laporan['fitur_geojson'].isna()),
+        ("Fitur GeoJSON tanpa data", laporan['nama_data'].isna()),
+    ]
+    for judul, mask in bagian:
+        print(f"\n{judul} ({mask.sum()}):")
+        if mask.any():
+            print(laporan[mask].to_string(index=False))
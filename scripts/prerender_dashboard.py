@@ -0,0 +1,78 @@
+"""Pra-render figur Dashboard untuk kombinasi filter yang paling sering dibuka.
+
+Jalankan dari root repo setiap kali data atau kode grafik berubah:
+
+    python scripts/prerender_dashboard.py [tahun ...]
+
+Untuk setiap wilayah (Semua + 5 kota) x bulan (Semua + 12 bulan) pada tahun
+yang diberikan (default: tahun terbaru, pilihan awal sidebar), semua grafik
+Dashboard pada level awal (LEVEL_DEFAULT) dan mode peta poligon disimpan
+sebagai JSON Plotly di folder `snapshot/`, ditambah `manifest.json` berisi
+hash file data/kode sumber. grafik.py hanya memakai snapshot jika hash-nya
+masih sama; selain itu grafik dihitung langsung seperti biasa.
+"""
+import hashlib
+import json
+import os
+import sys
+
+import plotly.io as pio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregasi import (  # noqa: E402
+    SEMUA_BULAN, SEMUA_KECAMATAN, SEMUA_KELURAHAN, SEMUA_WILAYAH, daftar_tahun,
+)
+from data_loader import BULAN_ORDER, SNAPSHOT_DIR  # noqa: E402
+from grafik import (  # noqa: E402
+    GRAFIK, LEVEL_DEFAULT, MANIFEST_SNAPSHOT,
+    bangun_figur, kecamatan_tanpa_peta, kunci_figur, kunci_snapshot, versi_snapshot,
+)
+from indeks import hierarki_wilayah  # noqa: E402
+
+# Mode "Titik Pusat" bukan pilihan awal sehingga tidak dipra-render
+GRAFIK_SNAPSHOT = [chart_id for chart_id in GRAFIK if not chart_id.endswith('_titik')]
+
+
+def kombinasi_filter(tahun):
+    for wilayah in [SEMUA_WILAYAH] + hierarki_wilayah().wilayah:
+        for bulan in [SEMUA_BULAN] + BULAN_ORDER:
+            yield (wilayah, bulan, SEMUA_KECAMATAN, SEMUA_KELURAHAN, tahun)
+
+
+def prerender(daftar):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    # Versi dihitung sebelum render: jika sumber berubah di tengah jalan,
+    # manifest langsung dianggap basi alih-alih menyimpan figur campuran
+    manifest = {'versi': versi_snapshot(), 'figur': {}, 'tanpa_peta': {}}
+    for tahun in daftar:
+        for filter_aktif in kombinasi_filter(tahun):
+            manifest['tanpa_peta'][kunci_snapshot(filter_aktif)] = kecamatan_tanpa_peta(*filter_aktif)
+            for chart_id in GRAFIK_SNAPSHOT:
+                kunci = kunci_figur(chart_id, *filter_aktif, level=LEVEL_DEFAULT.get(chart_id))
+                teks = kunci_snapshot(kunci)
+                if teks in manifest['figur']:
+                    continue
+                nama = hashlib.sha1(teks.encode("utf-8")).hexdigest()[:16] + ".json"
+                with open(os.path.join(SNAPSHOT_DIR, nama), "w", encoding="utf-8") as f:
+                    f.write(pio.to_json(bangun_figur(*kunci), validate=False))
+                manifest['figur'][teks] = nama
+
+    # Manifest ditulis terakhir dan diganti secara atomik
+    sementara = MANIFEST_SNAPSHOT + ".tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(sementara, MANIFEST_SNAPSHOT)
+
+    # Buang figur dari snapshot lama yang tidak lagi dirujuk manifest
+    dipakai = set(manifest['figur'].values()) | {os.path.basename(MANIFEST_SNAPSHOT)}
+    for nama in os.listdir(SNAPSHOT_DIR):
+        if nama.endswith(".json") and nama not in dipakai:
+            os.remove(os.path.join(SNAPSHOT_DIR, nama))
+    return manifest
+
+
+if __name__ == "__main__":
+    daftar = [int(t) for t in sys.argv[1:]] or daftar_tahun()[-1:]
+    manifest = prerender(daftar)
+    print(f"{len(manifest['figur'])} figur untuk tahun {daftar} ditulis ke {SNAPSHOT_DIR}")
@@ -0,0 +1,85 @@
+"""Bangun GeoJSON yang disederhanakan untuk peta choropleth Dashboard.
+
+Jalankan dari root repo setiap kali file GeoJSON sumber berubah:
+
+    python scripts/sederhanakan_geojson.py
+
+Untuk GeoJSON kecamatan dibuat beberapa tingkat (tier) toleransi di folder
+`geojson_tier/`, ditambah `manifest.json` yang dibaca oleh data_loader.py
+untuk memilih tier terkecil yang masih cukup detail untuk tinggi peta
+(tier diabaikan jika hash file sumber tidak sama dengan manifest).
+Batas kota administrasi (jakarta_geojson.json) hanya berisi puluhan titik
+sehingga tidak perlu disederhanakan.
+"""
+import json
+import os
+import sys
+
+import geopandas as gpd
+import shapely
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import GEOJSON_KECAMATAN, GEOJSON_TIER_DIR, sha1_file  # noqa: E402
+
+# Toleransi dalam derajat (0.001 derajat ~ 110 m di Jakarta)
+TOLERANSI = [0.0005, 0.001, 0.002]
+
+# 5 desimal ~ 1 m, jauh di bawah ukuran satu piksel peta
+PRESISI = 5
+
+
+def _sederhanakan(geometri, toleransi):
+    # simplify_coverage menjaga batas bersama antar poligon tetap berimpit
+    # (tidak ada celah/tumpang tindih antar kecamatan)
+    if hasattr(geometri, "simplify_coverage"):
+        hasil = geometri.simplify_coverage(toleransi)
+    else:
+        hasil = geometri.simplify(toleransi, preserve_topology=True)
+    return shapely.set_precision(hasil.values, 10 ** -PRESISI)
+
+
+def _bulatkan(koordinat):
+    if isinstance(koordinat, (list, tuple)):
+        return [_bulatkan(k) for k in koordinat]
+    return round(koordinat, PRESISI)
+
+
+def _tulis(gdf, geometri, path):
+    fitur = []
+    for props, geom in zip(gdf.drop(columns="geometry").to_dict("records"), geometri):
+        gj = shapely.geometry.mapping(geom)
+        fitur.append({
+            "type": "Feature",
+            "properties": props,
+            "geometry": {"type": gj["type"], "coordinates": _bulatkan(gj["coordinates"])},
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": fitur}, f, separators=(",", ":"))
+
+
+def bangun_tier(path_sumber):
+    gdf = gpd.read_file(path_sumber)
+    nama = os.path.splitext(os.path.basename(path_sumber))[0]
+    tier = []
+    for toleransi in TOLERANSI:
+        path = os.path.join(GEOJSON_TIER_DIR, f"{nama}.t{toleransi:g}.json")
+        geometri = _sederhanakan(gdf.geometry, toleransi)
+        _tulis(gdf, geometri, path)
+        tier.append({
+            "toleransi": toleransi,
+            "file": os.path.basename(path),
+            "bytes": os.path.getsize(path),
+            "koordinat": int(shapely.get_num_coordinates(geometri).sum()),
+        })
+        print(f"{os.path.basename(path)}: {tier[-1]['bytes']:,} bytes, {tier[-1]['koordinat']:,} titik")
+    # Hash sumber: data_loader.path_geojson memakai file asli jika sumber
+    # sudah berubah sejak tier dibangun
+    return {"sumber_sha1": sha1_file(path_sumber), "bbox": [float(v) for v in gdf.total_bounds], "tier": tier}
+
+
+if __name__ == "__main__":
+    os.makedirs(GEOJSON_TIER_DIR, exist_ok=True)
+    manifest = {os.path.basename(GEOJSON_KECAMATAN): bangun_tier(GEOJSON_KECAMATAN)}
+    with open(os.path.join(GEOJSON_TIER_DIR, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
@@ -0,0 +1,34 @@
+"""Tambahkan data kejadian banjir baru (mis. rilis bulanan Satu Data Jakarta).
+
+    python scripts/tambah_banjir.py data_baru.csv [data_baru2.csv ...] [--tahun 2025]
+
+File baru harus memakai kolom yang sama dengan banjir.csv; kolom label
+`kecamatan_wilayah` dan `kelurahan_kecamatan_wilayah` boleh tidak disertakan.
+Rilis tanpa kolom `tahun` (seperti file mentah Satu Data Jakarta) dilengkapi
+dengan --tahun; jika kolom itu ada, nilainya harus sama dengan --tahun.
+Baris ditambahkan di akhir banjir.csv, banjir.feather ditulis ulang dan
+rollup agregat diperbarui dari baris baru saja ke banjir.rollup.feather, jadi
+scripts/ingest_banjir.py tidak perlu dijalankan lagi dan Dashboard yang sedang
+berjalan tidak menghitung ulang rollup dari seluruh baris. Snapshot Dashboard
+menjadi basi; jalankan ulang scripts/prerender_dashboard.py sesudahnya.
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import DATA_CSV  # noqa: E402
+from ingest import tambah_kejadian  # noqa: E402
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", nargs="+", help="CSV kejadian banjir baru")
+    parser.add_argument("--tahun", type=int, help="tahun kejadian untuk file tanpa kolom `tahun`")
+    args = parser.parse_args()
+
+    for path in args.file:
+        jumlah = tambah_kejadian(pd.read_csv(path), tahun=args.tahun)
+        print(f"{os.path.basename(path)}: {jumlah} baris ditambahkan ke {os.path.basename(DATA_CSV)}")
@@ -0,0 +1,113 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from cache_lru import LRUCache
+from data_loader import (
+    GEOJSON_KECAMATAN, GEOJSON_WILAYAH,
+    load_geojson_kecamatan, load_geojson_wilayah, versi_data,
+)
+
+# Nama kolom koordinat yang dikenali pada laporan titik (lon, lat)
+KOLOM_KOORDINAT = [('lon', 'lat'), ('longitude', 'latitude'), ('lng', 'lat'), ('x', 'y')]
+
+
+class IndeksSpasial:
+    """STRtree atas poligon GeoJSON untuk menetapkan titik ke fitur.
+
+    Geometri dibaca dari GeoJSON resolusi penuh (bukan tier peta), sehingga
+    titik dekat batas wilayah tetap ditetapkan ke poligon yang benar. Kotak
+    batas (bbox) dan centroid setiap fitur ikut dihitung sekali di sini untuk
+    rentang peta dan mode peta titik pusat."""
+
+    def __init__(self, geojson, properti):
+        gdf = gpd.GeoDataFrame.from_features(geojson['features'])
+        self.nama = gdf[properti].astype(str).to_numpy()
+        self.geometri = gdf.geometry.to_numpy()
+        shapely.prepare(self.geometri)
+        self.tree = shapely.STRtree(self.geometri)
+
+        # (min_lon, min_lat, max_lon, max_lat) dan centroid per fitur
+        self.bbox = shapely.bounds(self.geometri)
+        pusat = shapely.centroid(self.geometri)
+        self.pusat = pd.DataFrame({
+            'name': self.nama, 'lon': shapely.get_x(pusat), 'lat': shapely.get_y(pusat),
+        })
+
+    def kotak(self, nama=None):
+        """Gabungan bbox fitur bernama `nama` (semua fitur jika None atau jika
+        tidak ada nama yang cocok)."""
+        bbox = self.bbox
+        if nama is not None:
+            terpilih = np.isin(self.nama, np.asarray(list(nama), dtype=object).astype(str))
+            if terpilih.any():
+                bbox = bbox[terpilih]
+        return (bbox[:, 0].min(), bbox[:, 1].min(), bbox[:, 2].max(), bbox[:, 3].max())
+
+    def tetapkan(self, lon, lat):
+        """Posisi fitur (int64, -1 jika di luar semua poligon atau koordinat
+        kosong) untuk setiap titik. Titik tepat di batas dua poligon
+        ditetapkan ke fitur dengan posisi terkecil."""
+        lon = np.asarray(lon, dtype='float64')
+        lat = np.asarray(lat, dtype='float64')
+        hasil = np.full(len(lon), -1, dtype='int64')
+        valid = np.flatnonzero(np.isfinite(lon) & np.isfinite(lat))
+        if not len(valid):
+            return hasil
+
+        idx_titik, idx_fitur = self.tree.query(shapely.points(lon[valid], lat[valid]), predicate='intersects')
+        # Satu fitur per titik: urutkan (titik, fitur) lalu ambil yang pertama
+        urutan = np.lexsort((idx_fitur, idx_titik))
+        idx_titik, idx_fitur = idx_titik[urutan], idx_fitur[urutan]
+        pertama = np.r_[True, idx_titik[1:] != idx_titik[:-1]]
+        hasil[valid[idx_titik[pertama]]] = idx_fitur[pertama]
+        return hasil
+
+
+_indeks = LRUCache(max_entries=4)
+
+
+def indeks_kecamatan():
+    """IndeksSpasial kecamatan (`properties.name`), dibangun sekali per versi file."""
+    return _indeks.get_or_compute(
+        versi_data(GEOJSON_KECAMATAN),
+        lambda: IndeksSpasial(load_geojson_kecamatan(), 'name')
+    )
+
+
+def indeks_wilayah():
+    """IndeksSpasial kota administrasi (`properties.province`), dibangun sekali per versi file."""
+    return _indeks.get_or_compute(
+        versi_data(GEOJSON_WILAYAH),
+        lambda: IndeksSpasial(load_geojson_wilayah(), 'province')
+    )
+
+
+def kolom_koordinat(df):
+    """Pasangan (kolom lon, kolom lat) pertama dari KOLOM_KOORDINAT yang ada
+    di `df` (tanpa membedakan huruf besar/kecil); ValueError jika tidak ada."""
+    kolom = {col.lower(): col for col in df.columns}
+    for lon, lat in KOLOM_KOORDINAT:
+        if lon in kolom and lat in kolom:
+            return kolom[lon], kolom[lat]
+    raise ValueError(f"Kolom koordinat tidak ditemukan; gunakan salah satu dari {KOLOM_KOORDINAT}")
+
+
+def agregat_titik(df, bobot=None):
+    """Jumlah kejadian per kecamatan dari laporan titik, dalam bentuk yang
+    sama dengan agregat `kecamatan_map` (semua fitur GeoJSON, nol jika tidak
+    ada laporan) sehingga bisa langsung dipakai peta choropleth kecamatan.
+
+    `bobot` adalah nama kolom jumlah kejadian per titik; tanpa bobot setiap
+    titik dihitung satu kejadian."""
+    indeks = indeks_kecamatan()
+    lon_col, lat_col = kolom_koordinat(df)
+    posisi = indeks.tetapkan(
+        pd.to_numeric(df[lon_col], errors='coerce').to_numpy(),
+        pd.to_numeric(df[lat_col], errors='coerce').to_numpy(),
+    )
+    nilai = np.ones(len(df)) if bobot is None else pd.to_numeric(df[bobot], errors='coerce').fillna(0).to_numpy()
+    di_dalam = posisi >= 0
+    jumlah = np.bincount(posisi[di_dalam], weights=nilai[di_dalam], minlength=len(indeks.nama))
+    return pd.DataFrame({'name': indeks.nama, 'jumlah_kejadian': jumlah.astype('float64')})
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from cache_lru import LRUCache
+from data_loader import versi_data
+
+UKURAN_HALAMAN = [25, 50, 100, 250]
+
+# Posisi baris hasil pencarian + pengurutan per (filter, kata kunci, urutan)
+_urutan = LRUCache(max_entries=64)
+
+
+def _cocok(df, kata):
+    # Kolom kategori dicocokkan lewat daftar kategorinya (sekali per nilai unik),
+    # lalu dipetakan ke baris lewat kode kategori tanpa operasi string per baris.
+    mask = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            cocok = series.cat.categories.astype(str).str.contains(kata, case=False, regex=False)
+            # Kode -1 (NaN) mengambil elemen terakhir yang selalu False
+            mask |= np.append(np.asarray(cocok, dtype=bool), False)[series.cat.codes.to_numpy()]
+        elif pd.api.types.is_string_dtype(series) or pd.api.types.is_object_dtype(series):
+            mask |= series.astype(str).str.contains(kata, case=False, regex=False).to_numpy()
+    return mask
+
+
+def _hitung_urutan(df, posisi, kata, kolom, naik):
+    if kata:
+        posisi = posisi[_cocok(df.iloc[posisi], kata)]
+    if kolom:
+        nilai = df[kolom].iloc[posisi].reset_index(drop=True)
+        urut = nilai.sort_values(ascending=naik, kind='stable', na_position='last').index.to_numpy()
+        posisi = posisi[urut]
+    return posisi
+
+
+def urutan_baris(df, kunci_filter, posisi_filter, kata="", kolom=None, naik=True):
+    """Posisi baris (untuk `iloc` pada `df` utuh) yang lolos filter, setelah
+    pencarian dan pengurutan.
+
+    `posisi_filter` adalah fungsi tanpa argumen yang mengembalikan posisi
+    baris hasil filter (mis. dari `IndeksFilter.posisi`) dan `kunci_filter`
+    harus mengidentifikasi pilihan filternya. Hasilnya di-cache sehingga
+    berpindah halaman tidak memfilter maupun mengurutkan ulang data."""
+    kata = kata.strip()
+    return _urutan.get_or_compute(
+        (versi_data(), kunci_filter, kata, kolom, naik),
+        lambda: _hitung_urutan(df, posisi_filter(), kata, kolom, naik)
+    )
+
+
+def ambil_halaman(df, posisi, nomor, ukuran):
+    """Potongan baris untuk halaman `nomor` (mulai dari 1); hanya baris pada
+    halaman itu yang diambil dari `df`."""
+    awal = (nomor - 1) * ukuran
+    return df.iloc[posisi[awal:awal + ukuran]]
+
+
+def jumlah_halaman(total, ukuran):
+    return max(1, -(-total // ukuran))
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indeks import IndeksFilter
+
+KOLOM = ['wilayah', 'kecamatan', 'bulan', 'tahun']
+
+
+def _data(n=1003, seed=7):
+    # n bukan kelipatan 8 agar sisa bit packbits ikut teruji
+    rng = np.random.default_rng(seed)
+    wilayah = rng.choice(['Barat', 'Timur', 'Utara', 'Selatan', 'Pusat'], n)
+    kecamatan = rng.choice([f'Kec {i}' for i in range(40)], n).astype(object)
+    kecamatan[rng.random(n) < 0.05] = None
+    bulan = pd.Categorical(rng.choice(['Januari', 'Februari', 'Maret'], n),
+                           categories=['Januari', 'Februari', 'Maret', 'April'])
+    bulan[rng.random(n) < 0.03] = np.nan
+    return pd.DataFrame({
+        'wilayah': pd.Categorical(wilayah),
+        'kecamatan': kecamatan,
+        'bulan': bulan,
+        'tahun': rng.choice([2023, 2024], n),
+    })
+
+
+def _acuan(df, pilihan):
+    mask = np.ones(len(df), dtype=bool)
+    for col, nilai in pilihan.items():
+        mask &= df[col].isin(nilai).to_numpy()
+    return np.flatnonzero(mask)
+
+
+def _pilihan_acak(rng, indeks):
+    pilihan = {}
+    for col in KOLOM:
+        if rng.random() < 0.3:
+            continue
+        opsi = indeks.opsi[col]
+        # Sedikit, lebih dari separuh (jalur komplemen), semua, atau kosong
+        jumlah = rng.choice([1, len(opsi) // 2 + 1, len(opsi), 0, rng.integers(0, len(opsi) + 1)])
+        pilihan[col] = list(rng.choice(opsi, jumlah, replace=False))
+    return pilihan
+
+
+@pytest.mark.parametrize('batas_bitmap', [None, 0], ids=['bitmap', 'tanpa_bitmap'])
+def test_acak_sama_dengan_isin(batas_bitmap):
+    df = _data()
+    indeks = IndeksFilter(df, KOLOM) if batas_bitmap is None else IndeksFilter(df, KOLOM, batas_bitmap)
+    rng = np.random.default_rng(2024)
+    for _ in range(600):
+        pilihan = _pilihan_acak(rng, indeks)
+        np.testing.assert_array_equal(indeks.posisi(pilihan), _acuan(df, pilihan), err_msg=str(pilihan))
+
+
+def test_opsi_tanpa_nan_dan_kategori_kosong():
+    indeks = IndeksFilter(_data(), KOLOM)
+    assert indeks.opsi['bulan'] == ['Februari', 'Januari', 'Maret']
+    assert None not in indeks.opsi['kecamatan']
+    assert indeks.opsi['tahun'] == [2023, 2024]
+
+
+def test_semua_nilai_membuang_nan():
+    # Semua opsi terpilih: baris NaN tetap terbuang (mask `_ada`)
+    df = _data()
+    indeks = IndeksFilter(df, KOLOM)
+    for col in ['kecamatan', 'bulan']:
+        pilihan = {col: indeks.opsi[col]}
+        np.testing.assert_array_equal(indeks.posisi(pilihan), np.flatnonzero(df[col].notna()))
+
+
+def test_tanpa_batasan():
+    df = _data()
+    indeks = IndeksFilter(df, KOLOM)
+    assert indeks.mask({}) is None
+    # Kolom tanpa NaN dengan semua opsi terpilih tidak membatasi baris
+    assert indeks.mask({'wilayah': indeks.opsi['wilayah'], 'tahun': indeks.opsi['tahun']}) is None
+    np.testing.assert_array_equal(indeks.posisi({}), np.arange(len(df)))
+
+
+def test_nilai_asing_dan_pilihan_kosong():
+    df = _data()
+    indeks = IndeksFilter(df, KOLOM)
+    assert len(indeks.posisi({'wilayah': []})) == 0
+    np.testing.assert_array_equal(
+        indeks.posisi({'wilayah': ['Barat', 'Tidak Ada']}), np.flatnonzero(df['wilayah'] == 'Barat')
+    )
+
+
+def test_kolom_tidak_ada_dilewati():
+    indeks = IndeksFilter(_data(), KOLOM + ['kelurahan'])
+    assert 'kelurahan' not in indeks.opsi
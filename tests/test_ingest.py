@@ -0,0 +1,111 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import agregasi
+from agregasi import FORMAT_ROLLUP, KOLOM_ROLLUP, hitung_rollup, rollup_data
+from cache_lru import LRUCache
+from data_loader import BASE_DIR, baca_kolumnar, clear_cache, load_banjir, path_rollup
+from ingest import tambah_kejadian, validasi_kejadian
+
+
+@pytest.fixture
+def acuan():
+    return load_banjir(os.path.join(BASE_DIR, "banjir.csv"))
+
+
+def _mentah(df):
+    # Baris seperti hasil pd.read_csv file rilis baru (teks biasa, bukan kategori)
+    return df.astype({col: object for col in df.select_dtypes(include='category').columns})
+
+
+@pytest.fixture
+def baru(acuan):
+    return _mentah(acuan.head(5)).reset_index(drop=True)
+
+
+def test_valid_dan_label_dilengkapi(acuan, baru):
+    hasil = validasi_kejadian(baru.drop(columns=['kecamatan_wilayah', 'kelurahan_kecamatan_wilayah']), acuan)
+    assert list(hasil.columns) == list(acuan.columns)
+    assert (hasil['kecamatan_wilayah'] == baru['kecamatan_wilayah']).all()
+
+
+@pytest.mark.parametrize('ubah, pesan', [
+    (lambda df: df.drop(columns=['jumlah_pengungsi']), "hilang: \\['jumlah_pengungsi'\\]"),
+    (lambda df: df.assign(catatan='x'), "asing: \\['catatan'\\]"),
+    (lambda df: df.assign(kecamatan=[None] + list(df['kecamatan'][1:])), "tidak boleh kosong"),
+    (lambda df: df.assign(jumlah_kejadian=['dua'] + list(df['jumlah_kejadian'][1:])), "bukan angka"),
+    (lambda df: df.assign(jumlah_kejadian=[1.5] + list(df['jumlah_kejadian'][1:])), "bilangan bulat"),
+    (lambda df: df.assign(jumlah_pengungsi=[-1] + list(df['jumlah_pengungsi'][1:])), "bilangan bulat"),
+    (lambda df: df.assign(bulan=['Jan'] + list(df['bulan'][1:])), "Nama bulan tidak dikenal"),
+    (lambda df: df.assign(triwulan=[4] + list(df['triwulan'][1:])), "triwulan"),
+    (lambda df: df.assign(kecamatan_wilayah=['Lain, Jakarta Barat'] + list(df['kecamatan_wilayah'][1:])),
+     "kecamatan_wilayah"),
+])
+def test_validasi_menolak(acuan, baru, ubah, pesan):
+    with pytest.raises(ValueError, match=pesan):
+        validasi_kejadian(ubah(baru), acuan)
+
+
+def test_tahun_dari_argumen(acuan, baru):
+    tanpa_tahun = baru.drop(columns=['tahun'])
+    with pytest.raises(ValueError, match="Kolom 'tahun' tidak ada"):
+        validasi_kejadian(tanpa_tahun, acuan)
+    assert (validasi_kejadian(tanpa_tahun, acuan, tahun=2026)['tahun'] == 2026).all()
+
+    # Kolom `tahun` yang ada harus sesuai dengan argumen
+    with pytest.raises(ValueError, match="selain 2026"):
+        validasi_kejadian(baru, acuan, tahun=2026)
+    assert validasi_kejadian(baru.assign(tahun=2026), acuan, tahun=2026)['tahun'].dtype == 'int64'
+
+
+def _urut(rollup):
+    return rollup.astype({col: str for col in KOLOM_ROLLUP}).sort_values(KOLOM_ROLLUP).reset_index(drop=True)
+
+
+def test_rollup_tambahan_sama_dengan_hitung_ulang(acuan, tmp_path, monkeypatch):
+    path = str(tmp_path / "banjir.csv")
+    shutil.copy(os.path.join(BASE_DIR, "banjir.csv"), path)
+    rollup_data(path)
+
+    # Tahun baru, kelurahan baru, dan kombinasi yang sudah ada di rollup lama
+    baru = _mentah(acuan.sample(40, random_state=1)).reset_index(drop=True)
+    baru.loc[:19, 'tahun'] = 2025
+    baru.loc[20:24, 'kelurahan'] = 'Kelurahan Baru'
+    baru['kelurahan_kecamatan_wilayah'] = (
+        baru['kelurahan'] + ", " + baru['kecamatan'] + ", " + baru['wilayah_adm']
+    )
+    assert tambah_kejadian(baru, path) == 40
+    # Rilis tanpa kolom `tahun`, tahun dari argumen
+    rilis = _mentah(acuan.head(10)).drop(columns=['tahun'])
+    assert tambah_kejadian(rilis, path, tahun=2026) == 10
+
+    clear_cache()
+    dihitung = hitung_rollup(load_banjir(path))
+    assert (load_banjir(path)['tahun'] == 2026).sum() == 10
+    pd.testing.assert_frame_equal(_urut(rollup_data(path)), _urut(dihitung))
+
+    # Proses lain: rollup dibaca dari file tersimpan, tidak dihitung ulang
+    tersimpan = baca_kolumnar(path, path_rollup(path), FORMAT_ROLLUP)
+    pd.testing.assert_frame_equal(_urut(tersimpan), _urut(dihitung))
+    monkeypatch.setattr(agregasi, '_rollup', LRUCache(max_entries=4))
+    monkeypatch.setattr(agregasi, 'hitung_rollup', lambda df: pytest.fail("rollup dihitung ulang"))
+    pd.testing.assert_frame_equal(_urut(rollup_data(path)), _urut(dihitung))
+
+
+def test_rollup_tersimpan_basi_dihitung_ulang(tmp_path, monkeypatch):
+    path = str(tmp_path / "banjir.csv")
+    shutil.copy(os.path.join(BASE_DIR, "banjir.csv"), path)
+    agregasi.simpan_rollup(hitung_rollup(load_banjir(path)).head(3), path)
+
+    # CSV berubah setelah rollup disimpan (baris terakhir dibuang): hash tidak
+    # cocok, rollup dihitung dari baris
+    with open(path, "rb") as f:
+        baris = f.read().splitlines(keepends=True)
+    with open(path, "wb") as f:
+        f.writelines(baris[:-1])
+    assert baca_kolumnar(path, path_rollup(path), FORMAT_ROLLUP) is None
+    monkeypatch.setattr(agregasi, '_rollup', LRUCache(max_entries=4))
+    assert len(rollup_data(path)) > 3
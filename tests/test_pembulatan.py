@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from agregasi import pembulatan_tinggi, pembulatan_tinggi_array
+
+
+def _skalar(nilai):
+    return np.array([pembulatan_tinggi(float(v)) for v in nilai], dtype='int64')
+
+
+def _cocok(nilai):
+    nilai = np.asarray(nilai, dtype='float64')
+    np.testing.assert_array_equal(pembulatan_tinggi_array(nilai), _skalar(nilai))
+
+
+def test_acak():
+    rng = np.random.default_rng(2024)
+    _cocok(rng.uniform(0, 500, 20_000))
+    _cocok(rng.uniform(-500, 500, 20_000))
+    # Rata-rata tinggi air di data berupa pecahan dengan banyak desimal
+    _cocok(rng.integers(0, 3000, 20_000) / rng.integers(1, 40, 20_000))
+
+
+def test_seri_x5():
+    # Tepat .x5 (round() Python membulatkan ke genap/menurut representasi biner)
+    _cocok([k + d / 100 for k in range(0, 60) for d in range(5, 100, 10)])
+
+
+def test_negatif():
+    _cocok([-0.04, -0.05, -0.06, -0.1, -0.5, -0.55, -0.6, -1.0, -1.45, -2.95, -10.96])
+
+
+def test_digit_nol():
+    _cocok([0.0, 1.0, 2.04, 3.0000001, 7.96, 9.99, 100.0, 12.049])
+
+
+def test_batas_digit():
+    # Tepat di bawah/di atas batas pembulatan 1 desimal dan batas digit 5/6
+    batas = np.array([k + d / 10 for k in range(0, 20) for d in (0.5, 5.5, 9.5)], dtype='float64')
+    _cocok(np.concatenate([np.nextafter(batas, -np.inf), batas, np.nextafter(batas, np.inf)]))
+    _cocok([1.55, 1.5499999, 1.5500001, 1.65, 1.6499999, 1.6500001, 0.95, 0.9499999, 0.9500001])
+
+
+def test_array_kosong():
+    assert pembulatan_tinggi_array([]).dtype == np.int64
+
+
+@pytest.mark.parametrize('nilai', [np.nan, np.inf, -np.inf])
+def test_tidak_finite(nilai):
+    with pytest.raises(ValueError):
+        pembulatan_tinggi_array([1.0, nilai])